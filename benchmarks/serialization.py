@@ -0,0 +1,89 @@
+"""
+Compares the default and the fast contact list serialization paths.
+
+The default path loads Contact entities and serializes them through ``ContactResponse``; the fast path
+(``fast_json_responses``) selects only the response columns and encodes the rows with orjson. Both are timed
+with and without the query, against an in-memory SQLite database.
+
+Run from the project root, so that the settings are read from ``.env``::
+
+    python -m benchmarks.serialization --rows 100 --repeat 500
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database.models import Base, Contact, User
+from src.repository import contacts as repository_contacts
+from src.schemas import ContactResponse
+from src.services.contacts_io import CONTACT_FIELDS, dump_contacts
+
+contact_list_adapter = TypeAdapter(List[ContactResponse])
+
+
+def serialize_entities(contacts) -> bytes:
+    return contact_list_adapter.dump_json(contact_list_adapter.validate_python(contacts, from_attributes=True))
+
+
+async def timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def main(rows: int, repeat: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    session_local = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    user = User(id=1, username="bench", email="bench@example.com", password="x")
+    async with session_local() as db:
+        db.add(user)
+        db.add_all(Contact(name=f"Name{i}", last_name=f"Last{i}", email=f"contact{i}@example.com",
+                           phone_number="+48123456789", date_of_birth=date(1990, 1 + i % 12, 1 + i % 28),
+                           additional_data="x" * 200, user_id=1) for i in range(rows))
+        await db.commit()
+
+    async with session_local() as db:
+        entities = await repository_contacts.get_contacts(0, rows, user, db)
+        tuples = await repository_contacts.get_contacts(0, rows, user, db, CONTACT_FIELDS)
+        assert serialize_entities(entities) == dump_contacts(tuples)
+
+        async def default_path():
+            serialize_entities(await repository_contacts.get_contacts(0, rows, user, db))
+
+        async def fast_path():
+            dump_contacts(await repository_contacts.get_contacts(0, rows, user, db, CONTACT_FIELDS))
+
+        async def default_encode():
+            serialize_entities(entities)
+
+        async def fast_encode():
+            dump_contacts(tuples)
+
+        results = [
+            ("query + serialize, default", await timed(default_path, repeat)),
+            ("query + serialize, fast", await timed(fast_path, repeat)),
+            ("serialize only, default", await timed(default_encode, repeat)),
+            ("serialize only, fast", await timed(fast_encode, repeat)),
+        ]
+    await engine.dispose()
+
+    print(f"{rows} contacts, {repeat} iterations")
+    for name, micros in results:
+        print(f"{name:<30} {micros:10.1f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100, help="Number of contacts per list")
+    parser.add_argument("--repeat", type=int, default=500, help="Number of timed iterations")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,48 @@
+"""
+Sends the emails queued in the Redis email outbox.
+
+Run one or more workers next to the web application, from the project root so that the settings are read
+from ``.env``::
+
+    python email_worker.py --name worker-1
+
+Workers share the consumer group, so each queued email is sent by one of them. SIGINT and SIGTERM stop a
+worker after its current batch; messages it has not acknowledged are picked up again by the others.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+from typing import Dict
+
+from src.database.redis_db import close_redis, get_redis
+from src.services.email import mail_sender, send_email
+from src.services.email_outbox import email_outbox
+
+
+async def deliver(message: Dict[str, str]) -> None:
+    await send_email(message["email"], message["username"], message["host"])
+
+
+async def main(name: str) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    email_outbox.init(get_redis())
+    try:
+        await email_outbox.run(name, deliver, stop)
+    finally:
+        await close_redis()
+        await mail_sender.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--name", default=f"{socket.gethostname()}-{os.getpid()}",
+                        help="Consumer name, unique per worker")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.name))
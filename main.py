@@ -1,13 +1,40 @@
-import redis.asyncio as redis
+from contextlib import asynccontextmanager
+
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_limiter import FastAPILimiter
-from fastapi_limiter.depends import RateLimiter
+from fastapi.staticfiles import StaticFiles
 
-from src.routes import contacts, auth, users
+from src.routes import contacts, auth, users, stats
 from src.conf.config import settings
-
-app = FastAPI()
+from src.database.db import engine
+from src.database.redis_db import close_redis, get_redis
+from src.services.avatars import avatar_service, create_avatar_storage
+from src.services.cache import contact_cache, user_cache
+from src.services.email import mail_sender
+from src.services.email_outbox import email_outbox
+from src.services.rate_limit import rate_limiter
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Shares the pooled Redis client with the rate limiter, the caches and the email outbox and configures the
+    avatar storage. Closes the Redis client, the database connection pool and the pooled SMTP connections on
+    shutdown.
+    """
+    redis = get_redis()
+    rate_limiter.init(redis)
+    contact_cache.init(redis)
+    user_cache.init(redis)
+    email_outbox.init(redis)
+    avatar_service.init(create_avatar_storage())
+    yield
+    await close_redis()
+    await engine.dispose()
+    await mail_sender.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = ["*"]
 
@@ -22,15 +49,12 @@ app.add_middleware(
 app.include_router(auth.router, prefix='/api')
 app.include_router(contacts.router, prefix='/api')
 app.include_router(users.router, prefix='/api')
+app.include_router(stats.router, prefix='/api')
+if settings.avatar_storage == 'local':
+    app.mount(settings.avatar_local_url, StaticFiles(directory=settings.avatar_local_dir, check_dir=False),
+              name='avatars')
 
 
-@app.on_event("startup")
-async def startup():
-    r = await redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0, encoding="utf-8",
-                          decode_responses=True)
-    await FastAPILimiter.init(r)
-
-
-@app.get("/", dependencies=[Depends(RateLimiter(times=2, seconds=5))])
+@app.get("/", dependencies=[Depends(rate_limiter.by_address)])
 def read_root():
     return {"message": "Hello World"}
@@ -0,0 +1,41 @@
+"""Added contact access path indexes
+
+Revision ID: 04d96fb2ef5d
+Revises: 8554f06fb4f1
+Create Date: 2026-10-17 10:12:41.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '04d96fb2ef5d'
+down_revision: Union[str, None] = '8554f06fb4f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Indexes are built concurrently so existing contacts tables stay writable during the migration.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contacts_user_id_id', 'contacts', ['user_id', 'id'],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_contacts_user_id_lower_name', 'contacts', ['user_id', sa.text('lower(name)')],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_contacts_user_id_lower_last_name', 'contacts', ['user_id', sa.text('lower(last_name)')],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_contacts_user_id_birthday', 'contacts',
+                        ['user_id', sa.text('EXTRACT(month FROM date_of_birth)'),
+                         sa.text('EXTRACT(day FROM date_of_birth)')],
+                        unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_contacts_user_id_birthday', table_name='contacts', postgresql_concurrently=True)
+        op.drop_index('ix_contacts_user_id_lower_last_name', table_name='contacts', postgresql_concurrently=True)
+        op.drop_index('ix_contacts_user_id_lower_name', table_name='contacts', postgresql_concurrently=True)
+        op.drop_index('ix_contacts_user_id_id', table_name='contacts', postgresql_concurrently=True)
@@ -0,0 +1,32 @@
+"""Added contact search trigram indexes
+
+Revision ID: 28123f570242
+Revises: 04d96fb2ef5d
+Create Date: 2026-10-17 11:03:27.518342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '28123f570242'
+down_revision: Union[str, None] = '04d96fb2ef5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for column in ('name', 'last_name', 'email'):
+            op.create_index(f'ix_contacts_{column}_trgm', 'contacts', [column], unique=False,
+                            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+                            postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in ('email', 'last_name', 'name'):
+            op.drop_index(f'ix_contacts_{column}_trgm', table_name='contacts', postgresql_concurrently=True)
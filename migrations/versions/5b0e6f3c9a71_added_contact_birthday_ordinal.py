@@ -0,0 +1,45 @@
+"""Added contact birthday ordinal
+
+Revision ID: 5b0e6f3c9a71
+Revises: 28123f570242
+Create Date: 2026-10-17 12:20:05.731904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b0e6f3c9a71'
+down_revision: Union[str, None] = '28123f570242'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('birthday_ordinal', sa.SmallInteger(), nullable=True))
+    # Day of the year counted in the leap year 2000, matching src.database.models.birthday_ordinal.
+    op.execute(
+        "UPDATE contacts SET birthday_ordinal = EXTRACT(doy FROM make_date(2000, "
+        "EXTRACT(month FROM date_of_birth)::int, EXTRACT(day FROM date_of_birth)::int)) "
+        "WHERE date_of_birth IS NOT NULL"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contacts_user_id_birthday_ordinal', 'contacts', ['user_id', 'birthday_ordinal'],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_contacts_birthday_ordinal', 'contacts', ['birthday_ordinal'],
+                        unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_contacts_user_id_birthday', table_name='contacts', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contacts_user_id_birthday', 'contacts',
+                        ['user_id', sa.text('EXTRACT(month FROM date_of_birth)'),
+                         sa.text('EXTRACT(day FROM date_of_birth)')],
+                        unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_contacts_birthday_ordinal', table_name='contacts', postgresql_concurrently=True)
+        op.drop_index('ix_contacts_user_id_birthday_ordinal', table_name='contacts', postgresql_concurrently=True)
+    op.drop_column('contacts', 'birthday_ordinal')
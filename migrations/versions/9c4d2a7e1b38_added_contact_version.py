@@ -0,0 +1,26 @@
+"""Added contact version
+
+Revision ID: 9c4d2a7e1b38
+Revises: 5b0e6f3c9a71
+Create Date: 2026-10-17 14:41:52.093617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d2a7e1b38'
+down_revision: Union[str, None] = '5b0e6f3c9a71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('contacts', 'version')
@@ -0,0 +1,42 @@
+"""Added contact sync tracking
+
+Revision ID: a61d0f4b7c93
+Revises: e3f7a1c8d250
+Create Date: 2026-10-17 15:58:31.206749
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61d0f4b7c93'
+down_revision: Union[str, None] = 'e3f7a1c8d250'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.add_column('contacts', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('contacts', sa.Column('sync_version', sa.BigInteger(), server_default='0', nullable=False))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contacts_email_live', 'contacts', ['email'], unique=True,
+                        postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True)
+        op.create_index('ix_contacts_user_id_sync_version', 'contacts', ['user_id', 'sync_version', 'id'],
+                        unique=False, postgresql_concurrently=True)
+    # Deleted contacts keep their email, so uniqueness only applies to live contacts from now on.
+    op.drop_constraint('contacts_email_key', 'contacts', type_='unique')
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM contacts WHERE deleted_at IS NOT NULL")
+    op.create_unique_constraint('contacts_email_key', 'contacts', ['email'])
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_contacts_user_id_sync_version', table_name='contacts', postgresql_concurrently=True)
+        op.drop_index('ix_contacts_email_live', table_name='contacts', postgresql_concurrently=True)
+    op.drop_column('contacts', 'sync_version')
+    op.drop_column('contacts', 'deleted_at')
+    op.drop_column('contacts', 'updated_at')
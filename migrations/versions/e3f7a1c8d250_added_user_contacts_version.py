@@ -0,0 +1,26 @@
+"""Added user contacts version
+
+Revision ID: e3f7a1c8d250
+Revises: 9c4d2a7e1b38
+Create Date: 2026-10-17 15:12:08.471305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f7a1c8d250'
+down_revision: Union[str, None] = '9c4d2a7e1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('contacts_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'contacts_version')
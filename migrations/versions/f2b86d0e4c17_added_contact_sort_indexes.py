@@ -0,0 +1,43 @@
+"""Added contact sort indexes
+
+Revision ID: f2b86d0e4c17
+Revises: a61d0f4b7c93
+Create Date: 2026-10-17 17:12:45.381904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b86d0e4c17'
+down_revision: Union[str, None] = 'a61d0f4b7c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The ID tie-breaker is part of each sort index, so sorted pages are read in index order and keyset
+    # cursors seek straight to their position. The new indexes cover the old (user_id, lower(...)) ones.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contacts_user_id_lower_name_id', 'contacts',
+                        ['user_id', sa.text('lower(name)'), 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_contacts_user_id_lower_last_name_id', 'contacts',
+                        ['user_id', sa.text('lower(last_name)'), 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_contacts_user_id_date_of_birth_id', 'contacts',
+                        ['user_id', 'date_of_birth', 'id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_contacts_user_id_lower_last_name', table_name='contacts', postgresql_concurrently=True)
+        op.drop_index('ix_contacts_user_id_lower_name', table_name='contacts', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contacts_user_id_lower_name', 'contacts', ['user_id', sa.text('lower(name)')],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_contacts_user_id_lower_last_name', 'contacts', ['user_id', sa.text('lower(last_name)')],
+                        unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_contacts_user_id_date_of_birth_id', table_name='contacts', postgresql_concurrently=True)
+        op.drop_index('ix_contacts_user_id_lower_last_name_id', table_name='contacts', postgresql_concurrently=True)
+        op.drop_index('ix_contacts_user_id_lower_name_id', table_name='contacts', postgresql_concurrently=True)
@@ -1,3 +1,5 @@
+from typing import Dict
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,18 +9,64 @@ class Settings(BaseSettings):
     postgres_password: str
     postgres_port: int
     sqlalchemy_database_url: str
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
     secret_key: str
     algorithm: str
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
     mail_username: str
     mail_password: str
     mail_from: str
     mail_port: int
     mail_server: str
+    mail_starttls: bool = True
+    mail_ssl_tls: bool = False
+    mail_use_credentials: bool = True
+    mail_validate_certs: bool = True
+    mail_pool_size: int = 4
+    mail_timeout: float = 60
+    mail_max_idle: float = 30
+    email_outbox_batch_size: int = 50
+    email_outbox_block_ms: int = 1000
+    email_outbox_max_attempts: int = 5
+    email_outbox_retry_base: float = 30
+    email_outbox_dead_maxlen: int = 100000
     redis_host: str = 'localhost'
     redis_port: int = 6379
+    redis_max_connections: int = 50
+    redis_pool_timeout: float = 5
+    redis_socket_timeout: float = 2
+    redis_socket_connect_timeout: float = 2
+    redis_health_check_interval: int = 30
+    rate_limit_default: str = '10/60'
+    rate_limits: Dict[str, str] = {'export_contacts': '5/60', 'import_contacts': '5/60', 'read_root': '2/5'}
+    rate_limit_local_size: int = 4096
+    contact_cache_ttl: int = 300
+    user_cache_size: int = 1024
+    user_cache_ttl: int = 300
+    user_cache_local_ttl: int = 30
+    token_cache_size: int = 4096
+    import_batch_size: int = 500
+    import_max_errors: int = 1000
+    export_batch_size: int = 1000
+    fast_json_responses: bool = False
+    count_estimate_threshold: int = 10000
     cloudinary_name: str
     cloudinary_api_key: str
     cloudinary_api_secret: str
+    avatar_storage: str = 'cloudinary'
+    avatar_local_dir: str = 'media/avatars'
+    avatar_local_url: str = '/avatars'
+    avatar_size: int = 250
+    avatar_quality: int = 85
+    avatar_max_bytes: int = 10 * 1024 * 1024
+    avatar_workers: int = 2
+    avatar_max_pending: int = 16
 
     class Config:
         env_file = ".env"
@@ -1,23 +1,60 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from .pool import MeteredQueuePool, pool_stats
 from ..conf.config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.sqlalchemy_database_url
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def get_async_database_url(url: str) -> str:
+    """
+    Converts a synchronous database URL into its asyncio driver equivalent.
+
+    Args:
+        url (str): The database URL, e.g. ``postgresql+psycopg2://...``.
 
-def get_db():
+    Returns:
+        str: The same URL using the ``asyncpg`` driver for PostgreSQL or ``aiosqlite`` for SQLite.
     """
-    Generator function to provide a database session.
+    url = make_url(url)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    elif url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+
+SQLALCHEMY_ASYNC_DATABASE_URL = get_async_database_url(SQLALCHEMY_DATABASE_URL)
+engine = create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    poolclass=MeteredQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+)
+
+SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+async def get_db():
+    """
+    Asynchronous generator function to provide a database session.
 
     Yields:
-        sqlalchemy.orm.Session: A SQLAlchemy database session.
+        sqlalchemy.ext.asyncio.AsyncSession: A SQLAlchemy asynchronous database session.
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def get_pool_stats() -> dict:
+    """
+    Returns connection pool metrics for the application engine.
+
+    Returns:
+        dict: Checked-out and overflow counts together with the checkout wait time histogram.
+    """
+    return pool_stats.snapshot(engine.sync_engine.pool)
@@ -0,0 +1,42 @@
+import json
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+
+class Explain(Executable, ClauseElement):
+    """
+    An ``EXPLAIN (FORMAT JSON)`` of a statement, compiled with the statement's own bound parameters.
+    """
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def planned_rows(statement: Select, db: AsyncSession) -> int:
+    """
+    Returns the number of rows the PostgreSQL planner expects a query to return, without running it.
+
+    The estimate comes from table statistics, so it costs the same however many rows match, but it may be
+    off by a wide margin, especially right after large writes.
+
+    Args:
+        statement (Select): The query to estimate.
+        db (AsyncSession): The database session.
+
+    Returns:
+        int: The estimated number of rows.
+    """
+    plan = (await db.execute(Explain(statement))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
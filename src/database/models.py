@@ -1,12 +1,32 @@
-from sqlalchemy import Column, Integer, String, Date, func, Boolean
-from sqlalchemy.orm import relationship
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import BigInteger, Column, Integer, SmallInteger, String, Date, func, Boolean, Index
+from sqlalchemy.orm import declarative_base, relationship, validates
 from sqlalchemy.sql.schema import ForeignKey
 from sqlalchemy.sql.sqltypes import DateTime
-from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
 
+def birthday_ordinal(day: Optional[date]) -> Optional[int]:
+    """
+    Returns the day of the year of a birthday, counted in a leap year.
+
+    Counting in a leap year gives every month/day a fixed ordinal regardless of the birth year, so
+    February 29th is always 60 and March 1st is always 61.
+
+    Args:
+        day (datetime.date, optional): The date of birth.
+
+    Returns:
+        int: The ordinal between 1 and 366, or None if no date is given.
+    """
+    if day is None:
+        return None
+    return date(2000, day.month, day.day).timetuple().tm_yday
+
+
 class Contact(Base):
     """
     Represents a contact entity in the database.
@@ -15,10 +35,17 @@ class Contact(Base):
         id (int): The primary key identifier for the contact.
         name (str): The name of the contact.
         last_name (str, optional): The last name of the contact.
-        email (str, unique): The email address of the contact.
+        email (str, unique among live contacts): The email address of the contact.
         phone_number (str): The phone number of the contact.
         date_of_birth (datetime.date, optional): The date of birth of the contact.
         additional_data (str, optional): Additional data related to the contact.
+        birthday_ordinal (int, optional): The leap-year day of the year of the date of birth, kept in sync
+            with date_of_birth.
+        version (int): Incremented on every update; used for optimistic concurrency and ETags.
+        updated_at (datetime.datetime): The timestamp of the last write, including deletion.
+        deleted_at (datetime.datetime, optional): Set when the contact is deleted; the row is kept as a
+            tombstone for delta sync.
+        sync_version (int): The owner's ``contacts_version`` after the last write; the delta sync position.
         user_id (int, optional): The foreign key referencing the associated user.
         user (User, optional): The relationship to the associated user entity.
     """
@@ -26,14 +53,39 @@ class Contact(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(50), nullable=False)
     last_name = Column(String(50))
-    email = Column(String, unique=True)
+    email = Column(String)
     phone_number = Column(String)
     date_of_birth = Column(Date)
     additional_data = Column(String, nullable=True)
+    birthday_ordinal = Column(SmallInteger, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    updated_at = Column(DateTime, nullable=False, default=func.now(), server_default=func.now())
+    deleted_at = Column(DateTime, nullable=True)
+    sync_version = Column(BigInteger, nullable=False, default=0, server_default='0')
     user_id = Column('user_id', ForeignKey(
         'users.id', ondelete='CASCADE'), default=None)
     user = relationship('User', backref="contacts")
 
+    @validates('date_of_birth')
+    def validate_date_of_birth(self, key, value):
+        self.birthday_ordinal = birthday_ordinal(value)
+        return value
+
+
+Index('ix_contacts_user_id_id', Contact.user_id, Contact.id)
+Index('ix_contacts_user_id_lower_name_id', Contact.user_id, func.lower(Contact.name), Contact.id)
+Index('ix_contacts_user_id_lower_last_name_id', Contact.user_id, func.lower(Contact.last_name), Contact.id)
+Index('ix_contacts_user_id_date_of_birth_id', Contact.user_id, Contact.date_of_birth, Contact.id)
+Index('ix_contacts_name_trgm', Contact.name, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+Index('ix_contacts_last_name_trgm', Contact.last_name, postgresql_using='gin',
+      postgresql_ops={'last_name': 'gin_trgm_ops'})
+Index('ix_contacts_email_trgm', Contact.email, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+Index('ix_contacts_user_id_birthday_ordinal', Contact.user_id, Contact.birthday_ordinal)
+Index('ix_contacts_birthday_ordinal', Contact.birthday_ordinal)
+Index('ix_contacts_email_live', Contact.email, unique=True, postgresql_where=Contact.deleted_at.is_(None),
+      sqlite_where=Contact.deleted_at.is_(None))
+Index('ix_contacts_user_id_sync_version', Contact.user_id, Contact.sync_version, Contact.id)
+
 
 class User(Base):
     """
@@ -48,6 +100,7 @@ class User(Base):
         avatar (str, optional): The URL to the user's avatar image.
         refresh_token (str, optional): The refresh token used for authentication.
         confirmed (bool): Indicates if the user's email address has been confirmed.
+        contacts_version (int): Incremented by every write to the user's contacts; the collection ETag.
     """
     __tablename__ = "users"
     id = Column(Integer, primary_key=True)
@@ -58,3 +111,4 @@ class User(Base):
     avatar = Column(String(255), nullable=True)
     refresh_token = Column(String(255), nullable=True)
     confirmed = Column(Boolean, default=False)
+    contacts_version = Column(BigInteger, nullable=False, default=0, server_default='0')
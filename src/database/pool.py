@@ -0,0 +1,105 @@
+import time
+from bisect import bisect_left
+from typing import Optional, Tuple
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue, Empty
+
+
+class PoolStats:
+    """
+    Collects connection pool checkout metrics.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Upper bounds, in seconds, of the checkout wait time histogram.
+        histogram (List[int]): Number of checkouts that fell into each bucket; the last slot counts
+            checkouts slower than the largest bound.
+        checkouts (int): Total number of connection checkouts.
+        timeouts (int): Number of checkouts that failed with a pool timeout.
+        total_wait (float): Sum of all checkout wait times, in seconds.
+    """
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Resets all collected metrics.
+        """
+        self.histogram = [0] * (len(self.buckets) + 1)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+
+    def observe(self, wait: float, timed_out: bool = False) -> None:
+        """
+        Records a single checkout.
+
+        Args:
+            wait (float): Time spent waiting for the connection, in seconds.
+            timed_out (bool, optional): Whether the checkout failed with a pool timeout.
+        """
+        self.histogram[bisect_left(self.buckets, wait)] += 1
+        self.checkouts += 1
+        self.total_wait += wait
+        if timed_out:
+            self.timeouts += 1
+
+    def snapshot(self, pool=None) -> dict:
+        """
+        Returns the collected metrics, optionally combined with the live state of a pool.
+
+        Args:
+            pool (sqlalchemy.pool.QueuePool, optional): The pool to report checked-out and overflow counts for.
+
+        Returns:
+            dict: The pool metrics.
+        """
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        stats = {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": self.total_wait,
+            "wait_seconds_histogram": dict(zip(bounds, self.histogram)),
+        }
+        if pool is not None:
+            stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            })
+        return stats
+
+
+pool_stats = PoolStats()
+
+
+class MeteredQueue(AsyncAdaptedQueue):
+    """
+    Connection queue that records in ``pool_stats`` how long each checkout waited for an idle connection.
+
+    Only the wait on the queue is timed. Opening a new connection when the queue is empty and the
+    ``pool_pre_ping`` round trip happen after the queue returns and are not included.
+    """
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().get(block, timeout)
+        except Empty:
+            # A blocking get only comes back empty when the pool timeout has elapsed.
+            timed_out = block
+            raise
+        finally:
+            pool_stats.observe(time.perf_counter() - start, timed_out)
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records checkout wait times and timeouts in ``pool_stats``.
+    """
+    _queue_class = MeteredQueue
@@ -0,0 +1,53 @@
+from redis.asyncio import BlockingConnectionPool, Redis
+
+from ..conf.config import settings
+
+redis_pool = BlockingConnectionPool(
+    host=settings.redis_host,
+    port=settings.redis_port,
+    db=0,
+    encoding="utf-8",
+    decode_responses=True,
+    max_connections=settings.redis_max_connections,
+    timeout=settings.redis_pool_timeout,
+    socket_timeout=settings.redis_socket_timeout,
+    socket_connect_timeout=settings.redis_socket_connect_timeout,
+    socket_keepalive=True,
+    health_check_interval=settings.redis_health_check_interval,
+)
+redis_client = Redis.from_pool(redis_pool)
+
+
+def get_redis() -> Redis:
+    """
+    Provides the application Redis client.
+
+    The client draws connections from ``redis_pool``, which waits up to ``redis_pool_timeout`` seconds for a
+    free connection instead of opening more than ``redis_max_connections``.
+
+    Returns:
+        Redis: The shared Redis client.
+    """
+    return redis_client
+
+
+async def close_redis() -> None:
+    """
+    Closes the application Redis client and disconnects all pooled connections.
+    """
+    await redis_client.aclose()
+
+
+def get_redis_pool_stats() -> dict:
+    """
+    Returns Redis connection pool metrics.
+
+    Returns:
+        dict: The maximum, created, in-use and idle connection counts.
+    """
+    return {
+        "max_connections": redis_pool.max_connections,
+        "created": len(redis_pool._in_use_connections) + len(redis_pool._available_connections),
+        "in_use": len(redis_pool._in_use_connections),
+        "available": len(redis_pool._available_connections),
+    }
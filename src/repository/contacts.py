@@ -1,12 +1,130 @@
-from typing import List
-from sqlalchemy import and_, extract
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from ..database.models import Contact, User
-from ..schemas import ContactModel, ContactUpdate
+import base64
+import binascii
+import calendar
+import json
+from functools import reduce
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 
+from sqlalchemy import Integer, Row, and_, any_, case, func, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, timedelta
+from ..database.explain import planned_rows
+from ..database.models import Contact, User, birthday_ordinal
+from ..schemas import ContactModel, ContactUpdate, ContactPatch
+from ..services.cache import contact_cache
 
-async def get_contacts(skip: int, limit: int, user: User, db: Session) -> List[Contact]:
+
+def _live(user: User):
+    """
+    Builds a filter matching the user's contacts that have not been deleted.
+
+    Args:
+        user (User): The user who owns the contacts.
+
+    Returns:
+        sqlalchemy.sql.ColumnElement: The filter expression.
+    """
+    return and_(Contact.user_id == user.id, Contact.deleted_at.is_(None))
+
+
+def _select(fields: Optional[Sequence[str]]):
+    """
+    Starts a contact query that loads either entities or only the given columns.
+
+    Args:
+        fields (Sequence[str], optional): Names of the Contact columns to select, or None for entities.
+
+    Returns:
+        sqlalchemy.sql.Select: The SELECT statement.
+    """
+    if fields is None:
+        return select(Contact)
+    return select(*[getattr(Contact, field) for field in fields])
+
+
+def _fetch(result, fields: Optional[Sequence[str]]) -> list:
+    """
+    Returns the entities or rows of a query started with ``_select``.
+
+    Args:
+        result (sqlalchemy.engine.Result): The query result.
+        fields (Sequence[str], optional): The ``fields`` the query was started with.
+
+    Returns:
+        list: Contact objects, or rows when ``fields`` is given.
+    """
+    return result.scalars().all() if fields is None else result.all()
+
+
+# asyncpg cannot bind more parameters than this to a single statement.
+MAX_BIND_PARAMS = 32767
+SORT_FIELDS = ("id", "name", "last_name", "date_of_birth")
+
+
+def _sort_key(field: str, operand):
+    """
+    Applies the sort transformation of a field to a column or value.
+
+    Names sort case-insensitively, matching the ``lower()`` expression indexes.
+
+    Args:
+        field (str): One of ``SORT_FIELDS``.
+        operand: The column, or the bound value of a keyset position.
+
+    Returns:
+        sqlalchemy.sql.ColumnElement: The sort key expression.
+    """
+    return func.lower(operand) if field in ("name", "last_name") else operand
+
+
+def _sort_order(sort: str) -> list:
+    """
+    Builds the ORDER BY clauses of a sort, with the contact ID as the tie-breaker so the order is total.
+
+    Args:
+        sort (str): A field of ``SORT_FIELDS``, prefixed with ``-`` for descending order.
+
+    Returns:
+        list: The ORDER BY clauses.
+    """
+    field = sort.lstrip("-")
+    order = [Contact.id] if field == "id" else [_sort_key(field, getattr(Contact, field)), Contact.id]
+    return [clause.desc() for clause in order] if sort.startswith("-") else order
+
+
+def _sort_after(sort: str, position: dict):
+    """
+    Builds a keyset filter matching the contacts that come after a cursor position in a sort.
+
+    NULL keys are placed the way PostgreSQL orders them: last in ascending and first in descending order.
+
+    Args:
+        sort (str): The sort the position was taken in.
+        position (dict): The cursor from ``decode_cursor``, with the contact ``id`` and, for sorts other than
+            ``id``, the value ``k`` of the sort field.
+
+    Returns:
+        sqlalchemy.sql.ColumnElement: The filter expression.
+    """
+    field, descending = sort.lstrip("-"), sort.startswith("-")
+    if field == "id":
+        return Contact.id < position["id"] if descending else Contact.id > position["id"]
+    column = getattr(Contact, field)
+    key = _sort_key(field, column)
+    value = position.get("k")
+    if value is None:
+        after_null = and_(column.is_(None), Contact.id < position["id"] if descending else Contact.id > position["id"])
+        return or_(after_null, column.isnot(None)) if descending else after_null
+    bound = tuple_(_sort_key(field, literal(value, column.type)), position["id"])
+    after = tuple_(key, Contact.id) < bound if descending else tuple_(key, Contact.id) > bound
+    if column.nullable and not descending:
+        return or_(after, column.is_(None))
+    return after
+
+
+async def get_contacts(skip: int, limit: int, user: User, db: AsyncSession,
+                       fields: Optional[Sequence[str]] = None, sort: str = "id") -> List[Contact]:
     """
     Retrieves a list of contacts for a particular user.
 
@@ -14,134 +132,666 @@ async def get_contacts(skip: int, limit: int, user: User, db: Session) -> List[C
         skip (int): The number of contacts to skip.
         limit (int): The maximum number of contacts to return.
         user (User): The user for whom contacts are retrieved.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
+        fields (Sequence[str], optional): Select only these columns and return rows instead of entities.
+        sort (str, optional): A field of ``SORT_FIELDS``, prefixed with ``-`` for descending order.
 
     Returns:
-        List[Contact]: A list of Contact objects filtered by the specified user ID.
+        List[Contact]: A list of Contact objects filtered by the specified user ID, or of rows when ``fields``
+        is given.
     """
-    return db.query(Contact).filter(Contact.user_id == user.id).offset(skip).limit(limit).all()
+    stmt = _select(fields).filter(_live(user)).order_by(*_sort_order(sort)).offset(skip).limit(limit)
+    return _fetch(await db.execute(stmt), fields)
+
+
+def _encode_token(payload: dict) -> str:
+    payload = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
 
+def _decode_token(token: str, *keys: str) -> dict:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as err:
+        raise ValueError("Invalid token") from err
+    if not isinstance(payload, dict) or not all(isinstance(payload.get(key), int) for key in keys):
+        raise ValueError("Invalid token")
+    return payload
 
-async def get_contact(contact_id: int, user: User, db: Session) -> Contact:
+
+def encode_cursor(contact: Contact, sort: str = "id") -> str:
+    """
+    Encodes the keyset position of a contact into an opaque pagination cursor.
+
+    Args:
+        contact (Contact): The last contact of the current page.
+        sort (str, optional): The sort of the pages.
+
+    Returns:
+        str: A URL-safe cursor pointing right after the given contact.
+    """
+    if sort == "id":
+        return _encode_token({"id": contact.id})
+    value = getattr(contact, sort.lstrip("-"))
+    if isinstance(value, date):
+        value = value.isoformat()
+    return _encode_token({"id": contact.id, "s": sort, "k": value})
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decodes an opaque pagination cursor.
+
+    Args:
+        cursor (str): The cursor returned by a previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed or its sort value does not fit its sort field.
+
+    Returns:
+        dict: The keyset position stored in the cursor, with the sort value ``k`` of a ``date_of_birth`` sort
+        converted to a date.
+    """
+    position = _decode_token(cursor, "id")
+    sort = position.get("s", "id")
+    if not isinstance(sort, str) or sort.lstrip("-") not in SORT_FIELDS:
+        raise ValueError("Invalid cursor")
+    value = position.get("k")
+    if sort.lstrip("-") == "id" or value is None:
+        return position
+    if not isinstance(value, str):
+        raise ValueError("Invalid cursor")
+    if sort.lstrip("-") == "date_of_birth":
+        position["k"] = date.fromisoformat(value)
+    return position
+
+
+def encode_sync_token(contact: Optional[Contact]) -> str:
+    """
+    Encodes the delta sync position right after a contact into an opaque sync token.
+
+    Tokens order by the contact's ``sync_version`` and then its ID, so they only ever move forward.
+
+    Args:
+        contact (Contact, optional): The last change returned, or None for the start of the history.
+
+    Returns:
+        str: A URL-safe sync token.
+    """
+    if contact is None:
+        return _encode_token({"v": 0, "id": 0})
+    return _encode_token({"v": contact.sync_version, "id": contact.id})
+
+
+def decode_sync_token(token: str) -> dict:
+    """
+    Decodes an opaque sync token.
+
+    Args:
+        token (str): The token returned by a previous sync.
+
+    Raises:
+        ValueError: If the token is malformed.
+
+    Returns:
+        dict: The ``sync_version`` (``v``) and contact ``id`` of the sync position.
+    """
+    return _decode_token(token, "v", "id")
+
+
+async def get_contacts_page(cursor: Optional[str], limit: int, user: User, db: AsyncSession,
+                            fields: Optional[Sequence[str]] = None,
+                            sort: str = "id") -> Tuple[List[Contact], Optional[str]]:
+    """
+    Retrieves a page of contacts for a particular user using keyset pagination on the sort key and the ID.
+
+    Unlike offset pagination, the cost of reading a page does not depend on how deep the page is.
+
+    Args:
+        cursor (str, optional): The cursor returned with the previous page, or None for the first page.
+        limit (int): The maximum number of contacts to return.
+        user (User): The user for whom contacts are retrieved.
+        db (AsyncSession): The database session.
+        fields (Sequence[str], optional): Select only these columns, which must include ``id`` and the sort
+            field, and return rows instead of entities.
+        sort (str, optional): A field of ``SORT_FIELDS``, prefixed with ``-`` for descending order.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort.
+
+    Returns:
+        Tuple[List[Contact], Optional[str]]: The contacts on the page and the cursor of the next page,
+        or None if there are no more contacts.
+    """
+    stmt = _select(fields).filter(_live(user))
+    if cursor:
+        position = decode_cursor(cursor)
+        if position.get("s", "id") != sort:
+            raise ValueError("Cursor was issued for another sort")
+        stmt = stmt.filter(_sort_after(sort, position))
+    stmt = stmt.order_by(*_sort_order(sort)).limit(limit + 1)
+    contacts = _fetch(await db.execute(stmt), fields)
+    if len(contacts) > limit:
+        contacts = contacts[:limit]
+        return contacts, encode_cursor(contacts[-1], sort)
+    return contacts, None
+
+
+async def stream_contacts(user: User, db: AsyncSession, fields: Sequence[str],
+                          batch_size: int = 1000) -> AsyncIterator[Row]:
+    """
+    Streams all contacts of a particular user from a server-side cursor.
+
+    Only the requested columns are selected, and rows are fetched ``batch_size`` at a time, so memory use
+    does not depend on the number of contacts.
+
+    Args:
+        user (User): The user whose contacts are streamed.
+        db (AsyncSession): The database session.
+        fields (Sequence[str]): Names of the Contact columns to select.
+        batch_size (int, optional): Number of rows fetched from the cursor per round trip.
+
+    Yields:
+        Row: One row per contact, ordered by ID.
+    """
+    stmt = _select(fields).filter(_live(user))
+    stmt = stmt.order_by(Contact.id).execution_options(yield_per=batch_size)
+    result = await db.stream(stmt)
+    async for partition in result.partitions():
+        for row in partition:
+            yield row
+
+
+async def get_contact(contact_id: int, user: User, db: AsyncSession,
+                      fields: Optional[Sequence[str]] = None) -> Contact:
     """
     Retrieves a single contact by its ID for a particular user.
 
     Args:
         contact_id (int): The ID of the contact to retrieve.
         user (User): The user who owns the contact.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
+        fields (Sequence[str], optional): Select only these columns and return a row instead of an entity.
+
+    Returns:
+        Contact: The Contact object with the specified ID and associated with the specified user, or a row
+        when ``fields`` is given.
+    """
+    stmt = _select(fields).filter(Contact.id == contact_id, _live(user))
+    contact = await db.execute(stmt)
+    return contact.scalar_one_or_none() if fields is None else contact.one_or_none()
+
+
+async def get_contact_version(contact_id: int, user: User, db: AsyncSession) -> Optional[int]:
+    """
+    Retrieves only the version of a contact, which is all a conditional GET needs.
+
+    Args:
+        contact_id (int): The ID of the contact.
+        user (User): The user who owns the contact.
+        db (AsyncSession): The database session.
+
+    Returns:
+        int: The contact's version, or None if the contact does not exist.
+    """
+    stmt = select(Contact.version).filter(Contact.id == contact_id, _live(user))
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+
+async def get_contacts_version(user: User, db: AsyncSession) -> int:
+    """
+    Retrieves the version of a user's whole contact collection.
+
+    Args:
+        user (User): The user who owns the contacts.
+        db (AsyncSession): The database session.
+
+    Returns:
+        int: The collection version; it changes whenever any of the user's contacts is written.
+    """
+    stmt = select(User.contacts_version).filter(User.id == user.id)
+    return (await db.execute(stmt)).scalar_one_or_none() or 0
+
+
+def _sync_values(user: User) -> dict:
+    """
+    Builds the bookkeeping columns of a contact write.
+
+    The written rows take the user's incremented ``contacts_version`` as their ``sync_version``. The increment
+    is an ``UPDATE users ... RETURNING`` CTE, so it runs in the same statement as the write, and the row lock it
+    takes on the user serializes concurrent writes to the user's contacts: sync versions become visible in
+    the order they are assigned.
+
+    Args:
+        user (User): The user who owns the contacts being written.
 
     Returns:
-        Contact: The Contact object with the specified ID and associated with the specified user.
+        dict: The ``sync_version`` and ``updated_at`` values.
     """
-    return db.query(Contact).filter(and_(Contact.id == contact_id, Contact.user_id == user.id)).first()
+    stmt = update(User).where(User.id == user.id).values(contacts_version=User.contacts_version + 1)
+    contacts_version = stmt.returning(User.contacts_version).cte("contacts_version")
+    return {"sync_version": select(contacts_version.c.contacts_version).scalar_subquery(), "updated_at": func.now()}
 
 
-async def create_contact(body: ContactModel, user: User, db: Session) -> Contact:
+async def create_contact(body: ContactModel, user: User, db: AsyncSession) -> Contact:
     """
     Creates a new contact for the particular user.
 
     Args:
         body (ContactModel): The data for the new contact.
         user (User): The user who owns the contact.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         Contact: The newly created Contact object.
     """
-    contact = Contact(
+    stmt = insert(Contact).values(
         name=body.name,
         last_name=body.last_name,
         email=body.email,
         phone_number=body.phone_number,
         date_of_birth=body.date_of_birth,
+        birthday_ordinal=birthday_ordinal(body.date_of_birth),
         additional_data=body.additional_data,
-        user_id=user.id
-    )
-    db.add(contact)
-    db.commit()
-    db.refresh(contact)
+        version=1,
+        user_id=user.id,
+        **_sync_values(user)
+    ).returning(Contact)
+    contact = (await db.execute(stmt)).scalar_one()
+    await db.commit()
+    await contact_cache.invalidate(user.id)
     return contact
 
 
-async def remove_contact(contact_id: int, user: User, db: Session) -> Contact:
+async def create_contacts(bodies: List[ContactModel], user: User, db: AsyncSession) -> List[Optional[int]]:
+    """
+    Creates many contacts for the particular user with multi-row INSERTs committed together.
+
+    Rows whose email already exists, in the database or earlier in the same batch, are skipped. Large batches
+    are split so that no statement binds more than ``MAX_BIND_PARAMS`` parameters.
+
+    Args:
+        bodies (List[ContactModel]): The data for the new contacts.
+        user (User): The user who owns the contacts.
+        db (AsyncSession): The database session.
+
+    Returns:
+        List[Optional[int]]: The ID of each new contact, in the order of ``bodies``, or None for skipped rows.
+    """
+    if not bodies:
+        return []
+    sync_values = _sync_values(user)
+    values = [
+        {
+            "name": body.name,
+            "last_name": body.last_name,
+            "email": body.email,
+            "phone_number": body.phone_number,
+            "date_of_birth": body.date_of_birth,
+            "additional_data": body.additional_data,
+            "birthday_ordinal": birthday_ordinal(body.date_of_birth),
+            "version": 1,
+            "user_id": user.id,
+            **sync_values,
+        }
+        for body in bodies
+    ]
+    inserted = {}
+    chunk_size = MAX_BIND_PARAMS // len(values[0])
+    for start in range(0, len(values), chunk_size):
+        stmt = insert(Contact).values(values[start:start + chunk_size]).on_conflict_do_nothing()
+        stmt = stmt.returning(Contact.id, Contact.email)
+        inserted.update({email: contact_id for contact_id, email in (await db.execute(stmt)).all()})
+    await db.commit()
+    await contact_cache.invalidate(user.id)
+    return [inserted.pop(body.email, None) for body in bodies]
+
+
+async def remove_contact(contact_id: int, user: User, db: AsyncSession) -> Contact:
     """
-    Removes a contact associated with the particular user.
+    Removes a contact associated with the particular user with a single UPDATE ... RETURNING statement.
+
+    The row is kept as a tombstone so that delta sync can report the deletion.
 
     Args:
         contact_id (int): The ID of the contact to remove.
         user (User): The user who owns the contact.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         Contact: The removed Contact object, or None if the contact does not exist.
     """
-    contact = db.query(Contact).filter(
-        and_(Contact.id == contact_id, Contact.user_id == user.id)).first()
+    stmt = update(Contact).where(Contact.id == contact_id, _live(user))
+    stmt = stmt.values(deleted_at=func.now(), **_sync_values(user)).returning(Contact)
+    contact = (await db.execute(stmt.execution_options(synchronize_session=False))).scalar_one_or_none()
     if contact:
-        db.delete(contact)
-        db.commit()
+        await db.commit()
+        await contact_cache.invalidate(user.id)
     return contact
 
 
-async def update_contact(contact_id: int, body: ContactUpdate, user: User, db: Session) -> Contact:
+async def update_contact(contact_id: int, body: ContactUpdate, user: User, db: AsyncSession) -> Contact:
     """
-     Updates a contact associated with the particular user.
+     Updates a contact associated with the particular user with a single UPDATE ... RETURNING statement.
 
     Args:
         contact_id (int): The ID of the contact to update.
         body (ContactUpdate): The data to update the contact with.
         user (User): The user who owns the contact.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         Contact: The updated Contact object, or None if the contact does not exist.
     """
-    contact = db.query(Contact).filter(
-        and_(Contact.id == contact_id, Contact.user_id == user.id)).first()
+    stmt = update(Contact).where(Contact.id == contact_id, _live(user)).values(
+        name=body.name,
+        last_name=body.last_name,
+        email=body.email,
+        phone_number=body.phone_number,
+        date_of_birth=body.date_of_birth,
+        birthday_ordinal=birthday_ordinal(body.date_of_birth),
+        additional_data=body.additional_data,
+        version=Contact.version + 1,
+        **_sync_values(user)
+    ).returning(Contact)
+    contact = (await db.execute(stmt.execution_options(synchronize_session=False))).scalar_one_or_none()
     if contact:
-        contact.name = body.name,
-        contact.last_name = body.last_name,
-        contact.email = body.email,
-        contact.phone_number = body.phone_number,
-        contact.date_of_birth = body.date_of_birth,
-        contact.additional_data = body.additional_data
-        db.commit()
+        await db.commit()
+        await contact_cache.invalidate(user.id)
     return contact
 
 
-async def search_contacts(user: User, db: Session, name: str = None, surname: str = None, email: str = None,
-                          upcoming_birthdays: bool = False) -> List[Contact]:
+async def patch_contact(contact_id: int, body: ContactPatch, user: User, db: AsyncSession,
+                        expected_version: Optional[int] = None) -> Optional[Contact]:
+    """
+    Partially updates a contact, writing only the columns that were sent, with a single UPDATE ... RETURNING.
+
+    Args:
+        contact_id (int): The ID of the contact to update.
+        body (ContactPatch): The fields to set.
+        user (User): The user who owns the contact.
+        db (AsyncSession): The database session.
+        expected_version (int, optional): Only update the contact if it still has this version.
+
+    Returns:
+        Contact: The updated Contact object, or None if the contact does not exist or has another version.
+    """
+    values = body.model_dump(exclude_unset=True)
+    if not values:
+        contact = await get_contact(contact_id, user, db)
+        if contact is None or expected_version not in (None, contact.version):
+            return None
+        return contact
+    if "date_of_birth" in values:
+        values["birthday_ordinal"] = birthday_ordinal(values["date_of_birth"])
+    stmt = update(Contact).where(Contact.id == contact_id, _live(user))
+    if expected_version is not None:
+        stmt = stmt.where(Contact.version == expected_version)
+    stmt = stmt.values(**values, version=Contact.version + 1, **_sync_values(user)).returning(Contact)
+    contact = (await db.execute(stmt.execution_options(synchronize_session=False))).scalar_one_or_none()
+    if contact:
+        await db.commit()
+        await contact_cache.invalidate(user.id)
+    return contact
+
+
+def birthday_window(start: date, days: int):
+    """
+    Builds a filter matching contacts whose birthday falls between ``start`` and ``days`` days later, inclusive.
+
+    The filter is a range scan on the indexed ``birthday_ordinal`` column; a window that crosses the end of
+    the year is split into two ranges. In a non-leap year, a window ending on February 28th also matches
+    February 29th birthdays, which would otherwise never fall into any window.
+
+    Args:
+        start (datetime.date): The first day of the window.
+        days (int): The length of the window in days.
+
+    Returns:
+        sqlalchemy.sql.ColumnElement: The filter expression.
+    """
+    if days >= 365:
+        return Contact.birthday_ordinal.isnot(None)
+    end = start + timedelta(days=days)
+    first = birthday_ordinal(start)
+    last = birthday_ordinal(end)
+    if (end.month, end.day) == (2, 28) and not calendar.isleap(end.year):
+        last += 1
+    if first <= last:
+        return Contact.birthday_ordinal.between(first, last)
+    return or_(Contact.birthday_ordinal >= first, Contact.birthday_ordinal <= last)
+
+
+async def get_upcoming_birthdays(days: int, db: AsyncSession, user: User = None) -> List[Contact]:
+    """
+    Retrieves contacts with a birthday within the next ``days`` days.
+
+    Args:
+        days (int): The length of the window in days, starting today.
+        db (AsyncSession): The database session.
+        user (User, optional): Restrict the result to this user's contacts; all users when None.
+
+    Returns:
+        List[Contact]: A list of Contact objects with an upcoming birthday.
+    """
+    query = select(Contact).filter(birthday_window(datetime.now().date(), days), Contact.deleted_at.is_(None))
+    if user is not None:
+        query = query.filter(Contact.user_id == user.id)
+    contacts = await db.execute(query.order_by(Contact.user_id, Contact.id))
+    return contacts.scalars().all()
+
+
+def _search_rank(column, term: str):
+    """
+    Builds the relevance score of a text column for a search term.
+
+    Prefix matches score one point above substring matches; within each group contacts are ranked by
+    pg_trgm word similarity.
+
+    Args:
+        column: The contact column being searched.
+        term (str): The search term.
+
+    Returns:
+        sqlalchemy.sql.ColumnElement: The score expression.
+    """
+    prefix = case((column.istartswith(term, autoescape=True), 1.0), else_=0.0)
+    return prefix + func.coalesce(func.word_similarity(term, column), 0.0)
+
+
+def _ids_filter(ids: List[int], user: User):
+    """
+    Builds a filter matching the given contact IDs of a user with a single ``id = ANY(:ids)`` array parameter.
+
+    Args:
+        ids (List[int]): The contact IDs.
+        user (User): The user who owns the contacts.
+
+    Returns:
+        sqlalchemy.sql.ColumnElement: The filter expression.
+    """
+    return and_(_live(user), Contact.id == any_(literal(list(ids), ARRAY(Integer))))
+
+
+async def update_contacts(ids: List[int], body: ContactPatch, user: User, db: AsyncSession) -> List[int]:
+    """
+    Applies the same partial update to many contacts of the particular user in a single UPDATE statement.
+
+    Args:
+        ids (List[int]): The IDs of the contacts to update.
+        body (ContactPatch): The fields to set; fields that were not sent are left unchanged.
+        user (User): The user who owns the contacts.
+        db (AsyncSession): The database session.
+
+    Returns:
+        List[int]: The IDs of the contacts that were updated.
+    """
+    values = body.model_dump(exclude_unset=True)
+    if not values:
+        return (await db.execute(select(Contact.id).filter(_ids_filter(ids, user)))).scalars().all()
+    if "date_of_birth" in values:
+        values["birthday_ordinal"] = birthday_ordinal(values["date_of_birth"])
+    stmt = update(Contact).where(_ids_filter(ids, user))
+    stmt = stmt.values(**values, version=Contact.version + 1, **_sync_values(user)).returning(Contact.id)
+    affected = (await db.execute(stmt.execution_options(synchronize_session=False))).scalars().all()
+    if affected:
+        await db.commit()
+        await contact_cache.invalidate(user.id)
+    else:
+        # Nothing matched, so the contacts version bumped by the statement must not be kept.
+        await db.rollback()
+    return affected
+
+
+async def remove_contacts(ids: List[int], user: User, db: AsyncSession) -> List[int]:
+    """
+    Removes many contacts of the particular user in a single UPDATE statement that turns them into tombstones.
+
+    Args:
+        ids (List[int]): The IDs of the contacts to remove.
+        user (User): The user who owns the contacts.
+        db (AsyncSession): The database session.
+
+    Returns:
+        List[int]: The IDs of the contacts that were removed.
+    """
+    stmt = update(Contact).where(_ids_filter(ids, user))
+    stmt = stmt.values(deleted_at=func.now(), **_sync_values(user)).returning(Contact.id)
+    affected = (await db.execute(stmt.execution_options(synchronize_session=False))).scalars().all()
+    if affected:
+        await db.commit()
+        await contact_cache.invalidate(user.id)
+    else:
+        # Nothing matched, so the contacts version bumped by the statement must not be kept.
+        await db.rollback()
+    return affected
+
+
+def _search_filters(user: User, name: str = None, surname: str = None, email: str = None,
+                    upcoming_birthdays: bool = False, birthday_days: int = 7) -> list:
+    """
+    Builds the filters of a contact search.
+
+    Args:
+        user (User): The user to search contacts for.
+        name (str, optional): The name to search for.
+        surname (str, optional): The surname to search for.
+        email (str, optional): The email to search for.
+        upcoming_birthdays (bool, optional): Whether to search for contacts with upcoming birthdays.
+        birthday_days (int, optional): The length of the upcoming birthdays window in days.
+
+    Returns:
+        list: The filter expressions.
+    """
+    filters = [_live(user)]
+    for column, term in ((Contact.name, name), (Contact.last_name, surname), (Contact.email, email)):
+        if term:
+            filters.append(column.icontains(term, autoescape=True))
+    if upcoming_birthdays:
+        filters.append(birthday_window(datetime.now().date(), birthday_days))
+    return filters
+
+
+async def count_contacts(user: User, db: AsyncSession, mode: str = "exact", threshold: int = 10000,
+                         **search) -> Tuple[int, bool]:
+    """
+    Counts the contacts of a particular user that match search criteria.
+
+    ``exact`` runs ``COUNT(*)``, whose cost grows with the number of matching contacts. ``planned`` returns
+    the planner's estimate, which costs the same for any tenant. ``estimated`` counts exactly when the
+    estimate is at most ``threshold`` and returns the estimate otherwise.
+
+    Args:
+        user (User): The user whose contacts are counted.
+        db (AsyncSession): The database session.
+        mode (str, optional): ``exact``, ``planned`` or ``estimated``.
+        threshold (int, optional): The largest estimate that is still counted exactly in ``estimated`` mode.
+        **search: The criteria of ``search_contacts``.
+
+    Returns:
+        Tuple[int, bool]: The number of contacts and whether it is exact.
+    """
+    filters = _search_filters(user, **search)
+    if mode != "exact":
+        estimate = await planned_rows(select(Contact.id).filter(*filters), db)
+        if mode == "planned" or estimate > threshold:
+            return estimate, False
+    stmt = select(func.count()).select_from(Contact).filter(*filters)
+    return (await db.execute(stmt)).scalar_one(), True
+
+
+async def search_contacts(user: User, db: AsyncSession, name: str = None, surname: str = None, email: str = None,
+                          upcoming_birthdays: bool = False, birthday_days: int = 7,
+                          limit: int = 100, fields: Optional[Sequence[str]] = None,
+                          sort: Optional[str] = None) -> List[Contact]:
     """
     Searches contacts associated with the particular user based on provided criteria.
 
+    Text filters are substring matches served by the pg_trgm GIN indexes on name, last_name and email.
+    Results are ordered by relevance, with prefix matches first, unless a sort is given.
+
     Args:
         user (User): The user to search contacts for.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
         name (str, optional): The name to search for.
         surname (str, optional): The surname to search for.
         email (str, optional): The email to search for.
         upcoming_birthdays (bool, optional): Whether to search for contacts with upcoming birthdays.
+        birthday_days (int, optional): The length of the upcoming birthdays window in days.
+        limit (int, optional): The maximum number of contacts to return.
+        fields (Sequence[str], optional): Select only these columns and return rows instead of entities.
+        sort (str, optional): A field of ``SORT_FIELDS``, prefixed with ``-`` for descending order, to order by
+            instead of relevance.
 
     Returns:
-        List[Contact]: A list of Contact objects that match the search criteria.
+        List[Contact]: A list of Contact objects that match the search criteria, or of rows when ``fields``
+        is given.
     """
-    query = db.query(Contact).filter(Contact.user_id == user.id)
+    query = _select(fields).filter(*_search_filters(user, name, surname, email, upcoming_birthdays, birthday_days))
+    if sort is not None:
+        query = query.order_by(*_sort_order(sort))
+    else:
+        ranks = [_search_rank(column, term)
+                 for column, term in ((Contact.name, name), (Contact.last_name, surname), (Contact.email, email))
+                 if term]
+        if ranks:
+            query = query.order_by(reduce(lambda a, b: a + b, ranks).desc())
+        query = query.order_by(Contact.id)
+    return _fetch(await db.execute(query.limit(limit)), fields)
 
-    if name:
-        query = query.filter(and_(Contact.name.ilike(f"%{name}%")))
-    if surname:
-        query = query.filter(and_(Contact.last_name.ilike(f"%{surname}%")))
-    if email:
-        query = query.filter(and_(Contact.email.ilike(f"%{email}%")))
-    if upcoming_birthdays:
-        today = datetime.now().date()
-        next_week = today + timedelta(days=7)
-        query = query.filter(
-            and_(
-                extract('month', Contact.date_of_birth) == today.month,
-                extract('day', Contact.date_of_birth) >= today.day,
-                extract('month', Contact.date_of_birth) == next_week.month,
-                extract('day', Contact.date_of_birth) <= next_week.day))
-    contacts = query.all()
-    return contacts
+
+async def get_changes(since: Optional[str], limit: int, user: User,
+                      db: AsyncSession) -> Tuple[List[Contact], str, bool]:
+    """
+    Retrieves the contacts of a particular user that were written after a sync token, oldest change first.
+
+    Every write stamps the contact with the user's next ``contacts_version``, and deleted contacts are kept as
+    tombstones, so a keyset scan on (user_id, sync_version, id) returns each changed contact once, in its
+    latest state. Without a token the live contacts are returned as the initial snapshot.
+
+    Args:
+        since (str, optional): The token returned by the previous sync, or None for a full sync.
+        limit (int): The maximum number of changes to return.
+        user (User): The user whose changes are retrieved.
+        db (AsyncSession): The database session.
+
+    Raises:
+        ValueError: If the token is malformed.
+
+    Returns:
+        Tuple[List[Contact], str, bool]: The changed contacts, where tombstones have ``deleted_at`` set, the
+        token to pass to the next sync, and whether more changes are waiting.
+    """
+    stmt = select(Contact).filter(Contact.user_id == user.id)
+    if since:
+        position = decode_sync_token(since)
+        stmt = stmt.filter(tuple_(Contact.sync_version, Contact.id) > tuple_(position["v"], position["id"]))
+    else:
+        stmt = stmt.filter(Contact.deleted_at.is_(None))
+    stmt = stmt.order_by(Contact.sync_version, Contact.id).limit(limit + 1)
+    contacts = (await db.execute(stmt)).scalars().all()
+    has_more = len(contacts) > limit
+    contacts = contacts[:limit]
+    if contacts:
+        return contacts, encode_sync_token(contacts[-1]), has_more
+    return contacts, since or encode_sync_token(None), has_more
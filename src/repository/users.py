@@ -1,79 +1,98 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..database.models import User
 from ..schemas import UserModel
+from ..services.cache import user_cache
 
 
-async def get_user_by_email(email: str, db: Session) -> User:
+async def get_user_by_email(email: str, db: AsyncSession) -> User:
     """
     Retrieves a user by their email address.
 
     Args:
         email (str): The email address of the user to retrieve.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         User: The User object if found, else None.
     """
-    return db.query(User).filter(User.email == email).first()
+    user = await db.execute(select(User).filter(User.email == email))
+    return user.scalar_one_or_none()
 
 
-async def create_user(body: UserModel, db: Session) -> User:
+async def create_user(body: UserModel, db: AsyncSession) -> User:
     """
     Creates a new user.
 
     Args:
         body (UserModel): The UserModel object containing user data.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         User: The newly created User object.
     """
     new_user = User(**body.dict())
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 
-async def update_token(user: User, token: str | None, db: Session) -> None:
+async def update_token(user: User, token: str | None, db: AsyncSession) -> None:
     """
     Updates the refresh token for a user.
 
     Args:
         user (User): The user for whom to update the token.
         token (str, optional): The new refresh token.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
     """
     user.refresh_token = token
-    db.commit()
+    await db.commit()
+    await user_cache.invalidate(user.email)
 
 
-async def confirmed_email(email: str, db: Session) -> None:
+async def update_password(user: User, password: str, db: AsyncSession) -> None:
+    """
+    Updates the password hash of a user.
+
+    Args:
+        user (User): The user whose password hash to update.
+        password (str): The new password hash.
+        db (AsyncSession): The database session.
+    """
+    user.password = password
+    await db.commit()
+
+
+async def confirmed_email(email: str, db: AsyncSession) -> None:
     """
     Confirms the email address of a user.
 
     Args:
         email (str): The email address to confirm.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
     """
     user = await get_user_by_email(email, db)
     user.confirmed = True
-    db.commit()
+    await db.commit()
+    await user_cache.invalidate(email)
 
 
-async def update_avatar(email, url: str, db: Session) -> User:
+async def update_avatar(email, url: str, db: AsyncSession) -> User:
     """
     Updates the avatar URL for a user.
 
     Args:
         email (str): The email address of the user.
         url (str): The new avatar URL.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         User: The updated User object if found, else None.
     """
     user = await get_user_by_email(email, db)
     user.avatar = url
-    db.commit()
+    await db.commit()
+    await user_cache.invalidate(email)
     return user
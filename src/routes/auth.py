@@ -2,20 +2,37 @@ from typing import List
 
 from fastapi import APIRouter, HTTPException, Depends, status, Security, BackgroundTasks, Request
 from fastapi.security import OAuth2PasswordRequestForm, HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database.db import get_db
 from ..schemas import UserModel, UserResponse, TokenModel, RequestEmail
 from ..repository import users as repository_users
 from ..services.auth import auth_service
 from ..services.email import send_email
+from ..services.email_outbox import email_outbox
 
 router = APIRouter(prefix='/auth', tags=["auth"])
 security = HTTPBearer()
 
 
+async def queue_email(background_tasks: BackgroundTasks, email: str, username: str, host: str) -> None:
+    """
+    Queues an email verification message in the email outbox.
+
+    When the outbox is unavailable, the email is sent from a background task of this process instead.
+
+    Args:
+        background_tasks (BackgroundTasks): Background task manager.
+        email (str): Email address of the recipient.
+        username (str): Username of the recipient.
+        host (str): Host URL for the verification link.
+    """
+    if not await email_outbox.enqueue(email, username, host):
+        background_tasks.add_task(send_email, email, username, host)
+
+
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def signup(body: UserModel, background_tasks: BackgroundTasks, request: Request, db: Session = Depends(get_db)):
+async def signup(body: UserModel, background_tasks: BackgroundTasks, request: Request, db: AsyncSession = Depends(get_db)):
     """
     Registers a new user.
 
@@ -23,7 +40,7 @@ async def signup(body: UserModel, background_tasks: BackgroundTasks, request: Re
         body (UserModel): The UserModel object containing user data.
         background_tasks (BackgroundTasks): Background task manager.
         request (Request): The request object.
-        db (Session, optional): The database session. Defaults to Depends(get_db).
+        db (AsyncSession, optional): The database session. Defaults to Depends(get_db).
 
     Returns:
         UserResponse: The response containing user details and confirmation message.
@@ -32,20 +49,22 @@ async def signup(body: UserModel, background_tasks: BackgroundTasks, request: Re
     if exist_user:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT,
                             detail="Account already exists")
-    body.password = auth_service.get_password_hash(body.password)
+    body.password = await auth_service.get_password_hash(body.password)
     new_user = await repository_users.create_user(body, db)
-    background_tasks.add_task(send_email, new_user.email, new_user.username, request.base_url)
+    await queue_email(background_tasks, new_user.email, new_user.username, str(request.base_url))
     return {"user": new_user, "detail": "User successfully created. Check your email for confirmation."}
 
 
 @router.post("/login", response_model=TokenModel)
-async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(body: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     Logs in a user and returns access and refresh tokens.
 
+    Passwords hashed with a bcrypt cost other than the configured one are rehashed on successful login.
+
     Args:
         body (OAuth2PasswordRequestForm, optional): The login form data. Defaults to Depends().
-        db (Session, optional): The database session. Defaults to Depends(get_db).
+        db (AsyncSession, optional): The database session. Defaults to Depends(get_db).
 
     Returns:
         TokenModel: The response containing access and refresh tokens.
@@ -56,9 +75,12 @@ async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depen
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email")
     if not user.confirmed:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Email not confirmed")
-    if not auth_service.verify_password(body.password, user.password):
+    verified, new_hash = await auth_service.verify_and_update_password(body.password, user.password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password")
+    if new_hash:
+        await repository_users.update_password(user, new_hash, db)
     access_token = await auth_service.create_access_token(data={"sub": user.email})
     refresh_token = await auth_service.create_refresh_token(data={"sub": user.email})
     await repository_users.update_token(user, refresh_token, db)
@@ -66,13 +88,13 @@ async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depen
 
 
 @router.get('/refresh_token', response_model=TokenModel)
-async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
+async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(security), db: AsyncSession = Depends(get_db)):
     """
     Refreshes the access token.
 
     Args:
         credentials (HTTPAuthorizationCredentials, optional): The authorization credentials. Defaults to Security(security).
-        db (Session, optional): The database session. Defaults to Depends(get_db).
+        db (AsyncSession, optional): The database session. Defaults to Depends(get_db).
 
     Returns:
         TokenModel: The response containing new access and refresh tokens.
@@ -92,13 +114,13 @@ async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(sec
 
 
 @router.get("/confirmed_email/{token}")
-async def confirmed_email(token: str, db: Session = Depends(get_db)):
+async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     """
     Confirms the email address of a user.
 
     Args:
         token (str): The verification token.
-        db (Session, optional): The database session. Defaults to Depends(get_db).
+        db (AsyncSession, optional): The database session. Defaults to Depends(get_db).
 
     Raises:
         HTTPException: If the user is not found or email is already confirmed.
@@ -123,7 +145,7 @@ async def request_email(
     body: RequestEmail,
     background_tasks: BackgroundTasks,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Requests email confirmation.
@@ -132,7 +154,7 @@ async def request_email(
         body (RequestEmail): The RequestEmail object containing the email address.
         background_tasks (BackgroundTasks): Background task manager.
         request (Request): The request object.
-        db (Session, optional): The database session. Defaults to Depends(get_db).
+        db (AsyncSession, optional): The database session. Defaults to Depends(get_db).
 
     Returns:
         dict: A message indicating the status of the request.
@@ -142,7 +164,5 @@ async def request_email(
     if user.confirmed:
         return {"message": "Your email is already confirmed"}
     if user:
-        background_tasks.add_task(
-            send_email, user.email, user.username, request.base_url
-        )
+        await queue_email(background_tasks, user.email, user.username, str(request.base_url))
     return {"message": "Check your email for confirmation."}
@@ -1,75 +1,315 @@
-from typing import List, Optional
+from typing import List, Literal, Optional, Tuple, Union
 
-from fastapi import APIRouter, HTTPException, Depends, status, Query
-from sqlalchemy.orm import Session
-from fastapi_limiter.depends import RateLimiter
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Request, Response, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database.db import get_db
 from ..database.models import User
-from ..schemas import ContactModel, ContactUpdate, ContactResponse
+from ..conf.config import settings
+from ..schemas import (ContactModel, ContactUpdate, ContactPatch, ContactResponse, ContactPage, ContactImportReport,
+                       ContactBatchUpdate, ContactBatchDelete, ContactBatchResult, ContactChanges,
+                       contact_response_model)
 from ..repository import contacts as repository_contacts
 from ..services.auth import auth_service
+from ..services.cache import contact_cache
+from ..services import contacts_io
+from ..services.etag import make_etag, etag_matches, etag_version
+from ..services.rate_limit import rate_limiter
 
 router = APIRouter(prefix='/contacts', tags=["contacts"])
+FIELDS_DESCRIPTION = "Comma-separated fields to return, e.g. `name,phone_number`; `id` is always included"
+SORT_DESCRIPTION = "Field to sort by, prefixed with `-` for descending order; ties are broken by `id`"
+COUNT_DESCRIPTION = ("Return the number of matching contacts in `X-Total-Count`: `exact` counts them, `planned` "
+                     "uses the database estimate and `estimated` counts only small results exactly")
+Sort = Literal["id", "-id", "name", "-name", "last_name", "-last_name", "date_of_birth", "-date_of_birth"]
+CountMode = Literal["exact", "planned", "estimated"]
 
 
-@router.get("/", response_model=List[ContactResponse], description='No more than 10 requests per minute',
-            dependencies=[Depends(RateLimiter(times=10, seconds=60))])
-async def read_contacts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db),
+def parse_fields(fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)) -> Optional[Tuple[str, ...]]:
+    """
+    Dependency that parses the ``fields`` sparse fieldset parameter.
+
+    Args:
+        fields (str, optional): Comma-separated field names. Defaults to None.
+
+    Raises:
+        HTTPException: If an unknown field is requested.
+
+    Returns:
+        Tuple[str, ...]: The fields to return, or None for all fields.
+    """
+    try:
+        return contacts_io.parse_fields(fields)
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err))
+
+
+def serialize_contacts(contacts, fields: Optional[Tuple[str, ...]]) -> bytes:
+    """
+    Encodes contacts loaded with ``select_fields(fields)`` as a JSON array.
+
+    Args:
+        contacts (Sequence): The contacts or rows.
+        fields (Tuple[str, ...], optional): The requested sparse fieldset.
+
+    Returns:
+        bytes: The JSON array.
+    """
+    if settings.fast_json_responses:
+        return contacts_io.dump_contacts(contacts)
+    return contacts_io.serialize_contacts(contacts, fields)
+
+
+def select_fields(fields: Optional[Tuple[str, ...]]) -> Optional[Tuple[str, ...]]:
+    """
+    Returns the columns to select for a contact list: the sparse fieldset, every response column on the fast
+    serialization path, or None to load entities.
+
+    Args:
+        fields (Tuple[str, ...], optional): The requested sparse fieldset.
+
+    Returns:
+        Tuple[str, ...]: The columns to select, or None.
+    """
+    if fields is None and settings.fast_json_responses:
+        return tuple(contacts_io.CONTACT_FIELDS)
+    return fields
+
+
+async def count_headers(mode: Optional[str], user: User, db: AsyncSession, **search) -> dict:
+    """
+    Counts the contacts matching a listing or search and returns the total count headers.
+
+    Args:
+        mode (str, optional): ``exact``, ``planned`` or ``estimated``, or None not to count.
+        user (User): The current user.
+        db (AsyncSession): The database session.
+        **search: The search criteria.
+
+    Returns:
+        dict: ``X-Total-Count`` and ``X-Total-Count-Estimated``, or no headers when ``mode`` is None.
+    """
+    if mode is None:
+        return {}
+    total, exact = await repository_contacts.count_contacts(user, db, mode, settings.count_estimate_threshold,
+                                                            **search)
+    return {"X-Total-Count": str(total), "X-Total-Count-Estimated": "false" if exact else "true"}
+
+
+@router.get("/", response_model=Union[List[ContactResponse], ContactPage],
+            description=rate_limiter.describe("read_contacts"),
+            dependencies=[Depends(rate_limiter)])
+async def read_contacts(skip: int = 0, limit: int = Query(100, ge=1),
+                        pagination: Literal["offset", "cursor"] = Query(
+                            "offset", description="Use `cursor` for keyset pagination with a `next_cursor`"),
+                        cursor: Optional[str] = Query(None, description="Cursor returned with the previous page"),
+                        sort: Sort = Query("id", description=SORT_DESCRIPTION),
+                        count: Optional[CountMode] = Query(None, description=COUNT_DESCRIPTION),
+                        if_none_match: Optional[str] = Header(None, description="ETag of the cached list"),
+                        fields: Optional[Tuple[str, ...]] = Depends(parse_fields),
+                        db: AsyncSession = Depends(get_db),
                         current_user: User = Depends(auth_service.get_current_user)
                         ):
     """
     Retrieves a list of contacts.
 
+    In ``offset`` mode a plain list is returned. In ``cursor`` mode (implied when ``cursor`` is given) a
+    page with the contacts and an opaque ``next_cursor`` is returned and ``skip`` is ignored; cursors are
+    only valid for the sort they were issued for.
+    With ``fields``, only those columns are selected and returned; in cursor mode the sort field is always
+    returned too. Serialized responses are cached per user until one of the user's contacts changes. With the
+    ``fast_json_responses`` setting, only the response columns are selected and encoded directly to JSON.
+    With ``count``, the number of contacts is returned in the ``X-Total-Count`` header; it is not cached.
+
+    The ETag is the user's collection version. When ``If-None-Match`` holds it, 304 is returned after reading
+    only that version.
+
     Args:
         skip (int, optional): Number of contacts to skip. Defaults to 0.
         limit (int, optional): Maximum number of contacts to return. Defaults to 100.
-        db (Session, optional): Database session. Defaults to Depends(get_db).
+        pagination (str, optional): Pagination mode, ``offset`` or ``cursor``. Defaults to ``offset``.
+        cursor (str, optional): Cursor returned with the previous page. Defaults to None.
+        sort (str, optional): Field to sort by, prefixed with ``-`` for descending order. Defaults to ``id``.
+        count (str, optional): Count mode, ``exact``, ``planned`` or ``estimated``. Defaults to None.
+        if_none_match (str, optional): ETag of the list the client already has. Defaults to None.
+        fields (Tuple[str, ...], optional): Sparse fieldset. Defaults to Depends(parse_fields).
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
         current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
 
+    Raises:
+        HTTPException: If the cursor or the fields are invalid.
+
     Returns:
-        List[ContactResponse]: List of contacts.
+        List[ContactResponse] | ContactPage: List of contacts, or a page of contacts in cursor mode.
     """
-    contacts = await repository_contacts.get_contacts(skip, limit, current_user, db)
-    return contacts
+    etag = None
+    if if_none_match:
+        etag = make_etag(await repository_contacts.get_contacts_version(current_user, db))
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    use_cursor = pagination == "cursor" or cursor is not None
+    if use_cursor and fields is not None and sort.lstrip("-") not in fields:
+        fields = tuple(field for field in contacts_io.CONTACT_FIELDS if field in fields or field == sort.lstrip("-"))
+    cache_key = f"page:{cursor}:{limit}:{sort}" if use_cursor else f"list:{skip}:{limit}:{sort}"
+    if fields is not None:
+        cache_key += ":" + ",".join(fields)
+    version, cached_etag, payload = await contact_cache.get_response(current_user.id, cache_key)
+    if payload is not None:
+        etag = cached_etag
+    else:
+        # The version is read before the contacts, so a concurrent write can only make the ETag stale, never
+        # attach a current ETag to outdated contacts.
+        if etag is None:
+            etag = make_etag(await repository_contacts.get_contacts_version(current_user, db))
+        columns = select_fields(fields)
+        if use_cursor:
+            try:
+                contacts, next_cursor = await repository_contacts.get_contacts_page(cursor, limit, current_user, db,
+                                                                                    columns, sort)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+            payload = contacts_io.dump_contact_page(serialize_contacts(contacts, fields), next_cursor)
+        else:
+            contacts = await repository_contacts.get_contacts(skip, limit, current_user, db, columns, sort)
+            payload = serialize_contacts(contacts, fields)
+        await contact_cache.set_response(current_user.id, version, cache_key, etag, payload)
+    headers = await count_headers(count, current_user, db)
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag, **headers})
+
+
+@router.get("/export", response_class=StreamingResponse, description=rate_limiter.describe("export_contacts"),
+            dependencies=[Depends(rate_limiter)])
+async def export_contacts(format: Literal["ndjson", "csv"] = Query("ndjson", description="Export format"),
+                          gzip: bool = Query(False, description="Gzip the export"),
+                          current_user: User = Depends(auth_service.get_current_user)):
+    """
+    Exports all contacts of the current user as NDJSON or CSV.
+
+    The export is streamed from a server-side cursor, so memory use stays flat however many contacts there are.
+
+    Args:
+        format (str, optional): ``ndjson`` or ``csv``. Defaults to ``ndjson``.
+        gzip (bool, optional): Whether to gzip the export. Defaults to False.
+        current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
+
+    Returns:
+        StreamingResponse: The export as a file download.
+    """
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"contacts.{format}"
+    if gzip:
+        media_type = "application/gzip"
+        filename += ".gz"
+    return StreamingResponse(
+        contacts_io.export_contacts(current_user, format, gzip, settings.export_batch_size),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/changes", response_model=ContactChanges, description=rate_limiter.describe("read_changes"),
+            dependencies=[Depends(rate_limiter)])
+async def read_changes(since: Optional[str] = Query(None, description="Token returned by the previous sync"),
+                       limit: int = Query(500, ge=1, le=1000, description="Maximum number of changes to return"),
+                       db: AsyncSession = Depends(get_db),
+                       current_user: User = Depends(auth_service.get_current_user)):
+    """
+    Retrieves the contacts created, updated or deleted since a sync token.
+
+    Without ``since`` the current contacts are returned as the initial snapshot. Clients keep ``next_token``
+    and pass it as ``since`` next time; while ``has_more`` is set, more changes can be fetched right away.
+
+    Args:
+        since (str, optional): Token returned by the previous sync. Defaults to None.
+        limit (int, optional): Maximum number of changes to return. Defaults to 500.
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
+        current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
+
+    Raises:
+        HTTPException: If the sync token is invalid.
+
+    Returns:
+        ContactChanges: The upserted contacts, the deleted contact IDs and the next sync token.
+    """
+    try:
+        contacts, next_token, has_more = await repository_contacts.get_changes(since, limit, current_user, db)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token")
+    return {
+        "upserts": [contact for contact in contacts if contact.deleted_at is None],
+        "deletions": [contact.id for contact in contacts if contact.deleted_at is not None],
+        "next_token": next_token,
+        "has_more": has_more,
+    }
 
 
-@router.get("/{contact_id}", response_model=ContactResponse, description='No more than 10 requests per minute',
-            dependencies=[Depends(RateLimiter(times=10, seconds=60))])
-async def read_contact(contact_id: int, db: Session = Depends(get_db),
+@router.get("/{contact_id}", response_model=ContactResponse, description=rate_limiter.describe("read_contact"),
+            dependencies=[Depends(rate_limiter)])
+async def read_contact(contact_id: int,
+                       if_none_match: Optional[str] = Header(None, description="ETag of the cached contact"),
+                       fields: Optional[Tuple[str, ...]] = Depends(parse_fields),
+                       db: AsyncSession = Depends(get_db),
                        current_user: User = Depends(auth_service.get_current_user)):
     """
-    Retrieves a single contact by ID.
+    Retrieves a single contact by ID. Serialized responses are cached per user until one of the user's
+    contacts changes.
+
+    The ETag is the contact's version. When ``If-None-Match`` holds it, 304 is returned after reading only
+    that version. With ``fields``, only those columns are selected and returned.
 
     Args:
         contact_id (int): ID of the contact to retrieve.
-        db (Session, optional): Database session. Defaults to Depends(get_db).
+        if_none_match (str, optional): ETag of the contact the client already has. Defaults to None.
+        fields (Tuple[str, ...], optional): Sparse fieldset. Defaults to Depends(parse_fields).
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
         current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
 
     Raises:
-        HTTPException: If the contact is not found.
+        HTTPException: If the contact is not found or the fields are invalid.
 
     Returns:
         ContactResponse: The retrieved contact.
     """
-    contact = await repository_contacts.get_contact(contact_id, current_user, db)
-    if contact is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
-    return contact
+    if if_none_match:
+        contact_version = await repository_contacts.get_contact_version(contact_id, current_user, db)
+        if contact_version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
+        etag = make_etag(contact_version)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    cache_key = f"contact:{contact_id}"
+    if fields is not None:
+        cache_key += ":" + ",".join(fields)
+    version, etag, payload = await contact_cache.get_response(current_user.id, cache_key)
+    if payload is None:
+        columns = fields + ("version",) if fields is not None else None
+        contact = await repository_contacts.get_contact(contact_id, current_user, db, columns)
+        if contact is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
+        etag = make_etag(contact.version)
+        model = ContactResponse if fields is None else contact_response_model(fields)
+        payload = model.model_validate(contact, from_attributes=True).model_dump_json()
+        await contact_cache.set_response(current_user.id, version, cache_key, etag, payload)
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
 
 
 @router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED,
-             description='No more than 10 requests per minute',
-             dependencies=[Depends(RateLimiter(times=10, seconds=60))])
-async def create_contact(body: ContactModel, db: Session = Depends(get_db),
+             description=rate_limiter.describe("create_contact"),
+             dependencies=[Depends(rate_limiter)])
+async def create_contact(body: ContactModel, db: AsyncSession = Depends(get_db),
                          current_user: User = Depends(auth_service.get_current_user)):
     """
     Creates a new contact.
 
     Args:
         body (ContactModel): The contact data.
-        db (Session, optional): Database session. Defaults to Depends(get_db).
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
         current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
 
     Returns:
@@ -78,9 +318,98 @@ async def create_contact(body: ContactModel, db: Session = Depends(get_db),
     return await repository_contacts.create_contact(body, current_user, db)
 
 
-@router.put("/{contact_id}", response_model=ContactResponse, description='No more than 10 requests per minute',
-            dependencies=[Depends(RateLimiter(times=10, seconds=60))])
-async def update_contact(body: ContactUpdate, contact_id: int, db: Session = Depends(get_db),
+@router.post("/import", response_model=ContactImportReport, description=rate_limiter.describe("import_contacts"),
+             dependencies=[Depends(rate_limiter)])
+async def import_contacts(request: Request,
+                          format: Optional[Literal["csv", "ndjson"]] = Query(
+                              None, description="Body format; taken from the Content-Type header when omitted"),
+                          db: AsyncSession = Depends(get_db),
+                          current_user: User = Depends(auth_service.get_current_user)):
+    """
+    Imports contacts from a CSV (with a header row) or NDJSON request body.
+
+    The body is parsed while it is received and inserted in batches, so files of any size are imported with
+    flat memory use. Invalid rows and rows with an email that already exists are skipped and reported.
+
+    Args:
+        request (Request): The request whose raw body holds the file.
+        format (str, optional): ``csv`` or ``ndjson``. Defaults to the format given by the Content-Type header.
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
+        current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
+
+    Raises:
+        HTTPException: If the format is not supported.
+
+    Returns:
+        ContactImportReport: The number of imported contacts and the per-row errors.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        if "csv" in content_type:
+            format = "csv"
+        elif "ndjson" in content_type or "jsonl" in content_type:
+            format = "ndjson"
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Expected CSV or NDJSON body")
+    parse = contacts_io.iter_csv_records if format == "csv" else contacts_io.iter_ndjson_records
+    return await contacts_io.import_contacts(parse(request.stream()), current_user, db,
+                                             batch_size=settings.import_batch_size,
+                                             max_errors=settings.import_max_errors)
+
+
+@router.post("/batch/update", response_model=ContactBatchResult,
+             description=rate_limiter.describe("update_contacts"),
+             dependencies=[Depends(rate_limiter)])
+async def update_contacts(body: ContactBatchUpdate, db: AsyncSession = Depends(get_db),
+                          current_user: User = Depends(auth_service.get_current_user)):
+    """
+    Applies the same partial update to many contacts in one transaction.
+
+    Args:
+        body (ContactBatchUpdate): The contact IDs and the fields to set.
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
+        current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
+
+    Raises:
+        HTTPException: If the update would give two contacts the same email.
+
+    Returns:
+        ContactBatchResult: The updated IDs and the IDs that were not found.
+    """
+    try:
+        affected = await repository_contacts.update_contacts(body.ids, body.patch, current_user, db)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Contact with this email already exists")
+    return {"affected": affected, "not_found": sorted(set(body.ids) - set(affected))}
+
+
+@router.post("/batch/delete", response_model=ContactBatchResult,
+             description=rate_limiter.describe("remove_contacts"),
+             dependencies=[Depends(rate_limiter)])
+async def remove_contacts(body: ContactBatchDelete, db: AsyncSession = Depends(get_db),
+                          current_user: User = Depends(auth_service.get_current_user)):
+    """
+    Deletes many contacts in one transaction.
+
+    Args:
+        body (ContactBatchDelete): The contact IDs.
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
+        current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
+
+    Returns:
+        ContactBatchResult: The deleted IDs and the IDs that were not found.
+    """
+    affected = await repository_contacts.remove_contacts(body.ids, current_user, db)
+    return {"affected": affected, "not_found": sorted(set(body.ids) - set(affected))}
+
+
+@router.put("/{contact_id}", response_model=ContactResponse, description=rate_limiter.describe("update_contact"),
+            dependencies=[Depends(rate_limiter)])
+async def update_contact(body: ContactUpdate, contact_id: int, response: Response,
+                         db: AsyncSession = Depends(get_db),
                          current_user: User = Depends(auth_service.get_current_user)):
     """
     Updates an existing contact.
@@ -88,7 +417,8 @@ async def update_contact(body: ContactUpdate, contact_id: int, db: Session = Dep
     Args:
         contact_id (int): ID of the contact to update.
         body (ContactUpdate): The updated contact data.
-        db (Session, optional): Database session. Defaults to Depends(get_db).
+        response (Response): The response, used to set the new ETag.
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
         current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
 
     Raises:
@@ -101,20 +431,62 @@ async def update_contact(body: ContactUpdate, contact_id: int, db: Session = Dep
     if contact is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
+    response.headers["ETag"] = make_etag(contact.version)
+    return contact
+
+
+@router.patch("/{contact_id}", response_model=ContactResponse, description=rate_limiter.describe("patch_contact"),
+              dependencies=[Depends(rate_limiter)])
+async def patch_contact(body: ContactPatch, contact_id: int, response: Response,
+                        if_match: Optional[str] = Header(None, description="ETag of the version being modified"),
+                        db: AsyncSession = Depends(get_db),
+                        current_user: User = Depends(auth_service.get_current_user)):
+    """
+    Partially updates an existing contact; only the fields that are sent are written.
+
+    With an ``If-Match`` header the update only succeeds if the contact still has that version.
+
+    Args:
+        body (ContactPatch): The fields to update.
+        contact_id (int): ID of the contact to update.
+        response (Response): The response, used to set the new ETag.
+        if_match (str, optional): ETag of the version the client last read. Defaults to None.
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
+        current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
+
+    Raises:
+        HTTPException: If the ETag is invalid, the contact is not found or it has been modified since.
+
+    Returns:
+        ContactResponse: The updated contact.
+    """
+    try:
+        expected_version = etag_version(if_match)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid If-Match header")
+    contact = await repository_contacts.patch_contact(contact_id, body, current_user, db, expected_version)
+    if contact is None:
+        if expected_version is not None and await repository_contacts.get_contact(contact_id, current_user, db):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Contact has been modified")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
+    response.headers["ETag"] = make_etag(contact.version)
     return contact
 
 
 @router.delete("/{contact_id}", response_model=ContactResponse,
-               description='No more than 10 requests per minute',
-               dependencies=[Depends(RateLimiter(times=10, seconds=60))])
-async def remove_contact(contact_id: int, db: Session = Depends(get_db),
+               description=rate_limiter.describe("remove_contact"),
+               dependencies=[Depends(rate_limiter)])
+async def remove_contact(contact_id: int, db: AsyncSession = Depends(get_db),
                          current_user: User = Depends(auth_service.get_current_user)):
     """
     Deletes a contact.
 
     Args:
         contact_id (int): ID of the contact to delete.
-        db (Session, optional): Database session. Defaults to Depends(get_db).
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
         current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
 
     Raises:
@@ -130,10 +502,12 @@ async def remove_contact(contact_id: int, db: Session = Depends(get_db),
     return contact
 
 
-@router.get("/filter/search", response_model=List[ContactResponse], description='No more than 10 requests per minute',
-            dependencies=[Depends(RateLimiter(times=10, seconds=60))])
+@router.get("/filter/search", response_model=List[ContactResponse],
+            description=rate_limiter.describe("search_contacts"),
+            dependencies=[Depends(rate_limiter)])
 async def search_contacts(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
     name: str = Query(None, title="Name filter",
                       description="Filter contacts by name"),
@@ -142,22 +516,49 @@ async def search_contacts(
     email: str = Query(None, title="Email filter",
                        description="Filter contacts by email address"),
     upcoming_birthdays: bool = Query(False, title="Upcoming birthdays",
-                                     description="Filter contacts with birthdays in the next 7 days"),
+                                     description="Filter contacts with birthdays in the next `birthday_days` days"),
+    birthday_days: int = Query(7, ge=0, le=366, title="Upcoming birthdays window",
+                               description="Length of the upcoming birthdays window in days"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of contacts to return"),
+    sort: Optional[Sort] = Query(None, description=SORT_DESCRIPTION + "; most relevant first when omitted"),
+    count: Optional[CountMode] = Query(None, description=COUNT_DESCRIPTION),
+    fields: Optional[Tuple[str, ...]] = Depends(parse_fields),
 ):
     """
-    Searches for contacts based on various filters.
+    Searches for contacts based on various filters. With ``fields``, only those columns are selected and
+    returned. With the ``fast_json_responses`` setting, only the response columns are selected and encoded
+    directly to JSON. With ``count``, the number of matching contacts is returned in the ``X-Total-Count``
+    header.
 
     Args:
-        db (Session, optional): Database session. Defaults to Depends(get_db).
+        response (Response): The response, used to set the count headers.
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
         current_user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
         name (str, optional): Name filter. Defaults to None.
         surname (str, optional): Surname filter. Defaults to None.
         email (str, optional): Email filter. Defaults to None.
         upcoming_birthdays (bool, optional): Filter for upcoming birthdays. Defaults to False.
+        birthday_days (int, optional): Length of the upcoming birthdays window in days. Defaults to 7.
+        limit (int, optional): Maximum number of contacts to return. Defaults to 100.
+        sort (str, optional): Field to sort by, prefixed with ``-`` for descending order. Defaults to None.
+        count (str, optional): Count mode, ``exact``, ``planned`` or ``estimated``. Defaults to None.
+        fields (Tuple[str, ...], optional): Sparse fieldset. Defaults to Depends(parse_fields).
+
+    Raises:
+        HTTPException: If the fields are invalid.
 
     Returns:
-        List[ContactResponse]: List of contacts that match the search criteria.
+        List[ContactResponse]: List of contacts that match the search criteria, most relevant first unless
+        ``sort`` is given.
     """
-    contacts = await repository_contacts.search_contacts(current_user, db, name=name, surname=surname, email=email,
-                                                         upcoming_birthdays=upcoming_birthdays)
+    search = dict(name=name, surname=surname, email=email, upcoming_birthdays=upcoming_birthdays,
+                  birthday_days=birthday_days)
+    columns = select_fields(fields)
+    contacts = await repository_contacts.search_contacts(current_user, db, limit=limit, fields=columns, sort=sort,
+                                                         **search)
+    headers = await count_headers(count, current_user, db, **search)
+    if columns is not None:
+        return Response(content=serialize_contacts(contacts, fields), media_type="application/json",
+                        headers=headers)
+    response.headers.update(headers)
     return contacts
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends
+
+from ..database.db import get_pool_stats
+from ..database.redis_db import get_redis_pool_stats
+from ..services.auth import auth_service
+from ..services.cache import user_cache
+from ..services.email_outbox import email_outbox
+
+# Metrics expose internal capacity and backlog figures, so they are only served to authenticated users.
+router = APIRouter(prefix='/stats', tags=["stats"], dependencies=[Depends(auth_service.get_current_user)])
+
+
+@router.get("/db_pool")
+async def read_db_pool_stats():
+    """
+    Retrieves database connection pool metrics.
+
+    Returns:
+        dict: Pool size, checked-out and overflow counts, timeouts and the checkout wait time histogram.
+    """
+    return get_pool_stats()
+
+
+@router.get("/redis_pool")
+async def read_redis_pool_stats():
+    """
+    Retrieves Redis connection pool metrics.
+
+    Returns:
+        dict: The maximum, created, in-use and idle connection counts.
+    """
+    return get_redis_pool_stats()
+
+
+@router.get("/auth")
+async def read_auth_stats():
+    """
+    Retrieves authentication cache metrics.
+
+    Returns:
+        dict: Size and hit/miss counters of the decoded token cache and the in-process user cache.
+    """
+    return {"token_cache": auth_service.token_cache.stats(), "user_cache": user_cache.local.stats()}
+
+
+@router.get("/email_outbox")
+async def read_email_outbox_stats():
+    """
+    Retrieves email outbox metrics.
+
+    Returns:
+        dict: Throughput counters of all email workers, the pending and unread message counts and the age of
+        the oldest unsent message.
+    """
+    return await email_outbox.stats()
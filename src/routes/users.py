@@ -1,13 +1,11 @@
 from fastapi import APIRouter, Depends, status, UploadFile, File
-from sqlalchemy.orm import Session
-import cloudinary
-import cloudinary.uploader
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database.db import get_db
 from ..database.models import User
 from ..repository import users as repository_users
 from ..services.auth import auth_service
-from ..conf.config import settings
+from ..services.avatars import avatar_service
 from ..schemas import UserDb
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -29,27 +27,24 @@ async def read_users_me(current_user: User = Depends(auth_service.get_current_us
 
 @router.patch('/avatar', response_model=UserDb)
 async def update_avatar_user(file: UploadFile = File(), current_user: User = Depends(auth_service.get_current_user),
-                             db: Session = Depends(get_db)):
+                             db: AsyncSession = Depends(get_db)):
     """
     Update the current user's avatar.
 
+    The image is cropped and scaled to a square JPEG (250x250 by default) and uploaded on the avatar worker
+    pool, off the event loop.
+
     Args:
         file (UploadFile, optional): File containing the new avatar image. Defaults to File(...).
         current_user (User, optional): Current authenticated user. Defaults to Depends(auth_service.get_current_user).
-        db (Session, optional): Database session. Defaults to Depends(get_db).
+        db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
+
+    Raises:
+        HTTPException: If the file is too large or not an image, or if the avatar pipeline is busy.
 
     Returns:
         UserDb: Updated details of the current user's profile.
     """
-    cloudinary.config(
-        cloud_name=settings.cloudinary_name,
-        api_key=settings.cloudinary_api_key,
-        api_secret=settings.cloudinary_api_secret,
-        secure=True
-    )
-
-    r = cloudinary.uploader.upload(file.file, public_id=f'contacts/{current_user.username}', overwrite=True)
-    src_url = cloudinary.CloudinaryImage(f'contacts/{current_user.username}')\
-                        .build_url(width=250, height=250, crop='fill', version=r.get('version'))
+    src_url = await avatar_service.update(file, f'contacts/{current_user.username}')
     user = await repository_users.update_avatar(current_user.email, src_url, db)
     return user
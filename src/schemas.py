@@ -1,5 +1,6 @@
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, constr, validator
+from functools import lru_cache
+from typing import Optional, List, Tuple, Type
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, constr, create_model, validator
 from datetime import date, datetime
 
 
@@ -36,7 +37,7 @@ class ContactBase(BaseModel):
         Returns:
             date: The validated date of birth.
         """
-        if v > date.today():
+        if v is not None and v > date.today():
             raise ValueError("Date of birth cannot be in the future")
         return v
 
@@ -61,6 +62,76 @@ class ContactUpdate(ContactModel):
     pass
 
 
+class ContactPatch(BaseModel):
+    """
+    Model for a partial contact update; only the fields that are sent are changed.
+
+    Attributes:
+        name (str): The name of the contact; it cannot be cleared.
+        last_name (Optional[str]): The last name of the contact; may be cleared with null.
+        email (Optional[EmailStr]): The email address of the contact; may be cleared with null.
+        phone_number (Optional[str]): The phone number of the contact; may be cleared with null.
+        date_of_birth (Optional[date]): The date of birth of the contact; may be cleared with null.
+        additional_data (Optional[str]): Additional data about the contact; may be cleared with null.
+    """
+    name: str = Field(None, min_length=1, max_length=50)
+    last_name: Optional[str] = Field(None, min_length=1, max_length=50)
+    email: Optional[EmailStr] = None
+    phone_number: Optional[str] = Field(None, pattern=r'^\+?[1-9]\d{1,14}$')
+    date_of_birth: Optional[date] = None
+    additional_data: Optional[str] = None
+
+    @validator("date_of_birth")
+    def validate_date_of_birth(cls, v):
+        """
+        Validator to ensure the date of birth is not in the future.
+
+        Args:
+            v (Optional[date]): The date of birth, or None to clear it.
+
+        Raises:
+            ValueError: If the date of birth is in the future.
+
+        Returns:
+            Optional[date]: The validated date of birth.
+        """
+        return ContactBase.validate_date_of_birth(v)
+
+
+class ContactBatchUpdate(BaseModel):
+    """
+    Model for applying the same partial update to many contacts.
+
+    Attributes:
+        ids (List[int]): The IDs of the contacts to update.
+        patch (ContactPatch): The fields to set on every contact.
+    """
+    ids: List[int] = Field(min_length=1, max_length=1000)
+    patch: ContactPatch
+
+
+class ContactBatchDelete(BaseModel):
+    """
+    Model for deleting many contacts.
+
+    Attributes:
+        ids (List[int]): The IDs of the contacts to delete.
+    """
+    ids: List[int] = Field(min_length=1, max_length=1000)
+
+
+class ContactBatchResult(BaseModel):
+    """
+    Model for the result of a batch operation.
+
+    Attributes:
+        affected (List[int]): The IDs of the contacts that were changed.
+        not_found (List[int]): The requested IDs that do not belong to any of the user's contacts.
+    """
+    affected: List[int]
+    not_found: List[int]
+
+
 class ContactResponse(ContactBase):
     """
     Model for response containing contact information.
@@ -70,16 +141,115 @@ class ContactResponse(ContactBase):
 
     Attributes:
         id (int): The unique identifier for the contact.
+        last_name (Optional[str]): The last name of the contact, None if it was cleared.
+        email (Optional[EmailStr]): The email address of the contact, None if it was cleared.
+        phone_number (Optional[str]): The phone number of the contact, None if it was cleared.
+        date_of_birth (Optional[date]): The date of birth of the contact, None if it was cleared.
 
     Config:
         orm_mode (bool): Allows ORM mode for the model.
     """
     id: int
+    last_name: Optional[str] = Field(min_length=1, max_length=50)
+    email: Optional[EmailStr]
+    phone_number: Optional[str] = Field(pattern=r'^\+?[1-9]\d{1,14}$')
+    date_of_birth: Optional[date]
 
     class Config:
         orm_mode = True
 
 
+@lru_cache(maxsize=None)
+def contact_response_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Builds a ``ContactResponse`` trimmed to the given fields, for sparse fieldset responses.
+
+    Models are cached, so each combination of fields is only built once.
+
+    Args:
+        fields (Tuple[str, ...]): Names of ``ContactResponse`` fields, in response order.
+
+    Returns:
+        Type[BaseModel]: The trimmed response model.
+    """
+    return create_model(
+        "ContactFieldsResponse",
+        __config__=ConfigDict(from_attributes=True),
+        **{field: (ContactResponse.model_fields[field].annotation, ContactResponse.model_fields[field])
+           for field in fields},
+    )
+
+
+class ContactPage(BaseModel):
+    """
+    Model for a page of contacts returned by cursor pagination.
+
+    Attributes:
+        items (List[ContactResponse]): The contacts on this page.
+        next_cursor (Optional[str]): Opaque cursor for the next page, or None if this is the last page.
+    """
+    items: List[ContactResponse]
+    next_cursor: Optional[str] = None
+
+
+class ContactSyncItem(ContactResponse):
+    """
+    Model for a created or updated contact returned by delta sync.
+
+    Attributes:
+        version (int): The contact version, usable with ``If-Match``.
+        updated_at (datetime): The time of the last write.
+    """
+    version: int
+    updated_at: datetime
+
+
+class ContactChanges(BaseModel):
+    """
+    Model for the changes to a user's contacts since a sync token.
+
+    Attributes:
+        upserts (List[ContactSyncItem]): Contacts created or updated since the token, in their latest state.
+        deletions (List[int]): IDs of the contacts deleted since the token.
+        next_token (str): Opaque token to pass as ``since`` in the next sync.
+        has_more (bool): Whether more changes are waiting; if so, sync again right away with ``next_token``.
+    """
+    upserts: List[ContactSyncItem]
+    deletions: List[int]
+    next_token: str
+    has_more: bool
+
+
+class ContactImportError(BaseModel):
+    """
+    Model for a row rejected by a contact import.
+
+    Attributes:
+        row (int): The 1-based data row (CSV) or line (NDJSON) number.
+        errors (List[str]): Why the row was rejected.
+    """
+    row: int
+    errors: List[str]
+
+
+class ContactImportReport(BaseModel):
+    """
+    Model for the result of a contact import.
+
+    Attributes:
+        total (int): Number of rows read.
+        inserted (int): Number of contacts created.
+        failed (int): Number of rejected rows.
+        errors (List[ContactImportError]): The rejected rows, up to the configured maximum.
+        errors_truncated (bool): Whether more rows were rejected than reported.
+    """
+    total: int
+    inserted: int
+    failed: int
+    errors: List[ContactImportError]
+    errors_truncated: bool = False
+
+
 class UserModel(BaseModel):
     """
     Model for user information.
@@ -1,26 +1,66 @@
-from typing import Optional
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..conf.config import settings
 from ..database.db import get_db
 from ..repository import users as repository_users
+from .cache import LRUCache, user_cache
 
 
 class Auth:
     """
     Authentication utilities class.
+
+    Password hashing runs on a dedicated, size-limited thread pool so bcrypt never blocks the event loop.
+    When more than ``password_hash_max_pending`` operations are queued, new ones are rejected with 503.
     """
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto",
+                               bcrypt__default_rounds=settings.bcrypt_rounds,
+                               bcrypt__min_rounds=settings.bcrypt_rounds,
+                               bcrypt__max_rounds=settings.bcrypt_rounds)
+    pwd_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers,
+                                      thread_name_prefix="password-hash")
+    pwd_max_pending = settings.password_hash_max_pending
+    pwd_pending = 0
     SECRET_KEY = "secret_key"
     ALGORITHM = "HS256"
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+    token_cache = LRUCache(maxsize=settings.token_cache_size, ttl=15 * 60)
 
-    def verify_password(self, plain_password, hashed_password):
+    async def _run_password_task(self, func, *args):
+        """
+        Run a password hashing function on the password worker pool.
+
+        Args:
+            func (Callable): The blocking function to run.
+            *args: Arguments for the function.
+
+        Returns:
+            Any: The result of the function.
+
+        Raises:
+            HTTPException: If too many password operations are already queued.
+        """
+        if self.pwd_pending >= self.pwd_max_pending:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="Server is busy, try again later")
+        Auth.pwd_pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pwd_executor, func, *args)
+        finally:
+            Auth.pwd_pending -= 1
+
+    async def verify_password(self, plain_password, hashed_password):
         """
         Verify whether the plain password matches the hashed password.
 
@@ -31,9 +71,22 @@ class Auth:
         Returns:
             bool: True if the passwords match, False otherwise.
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return await self._run_password_task(self.pwd_context.verify, plain_password, hashed_password)
 
-    def get_password_hash(self, password: str):
+    async def verify_and_update_password(self, plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and rehash it if the stored hash does not use the configured bcrypt cost.
+
+        Args:
+            plain_password (str): Plain text password.
+            hashed_password (str): Hashed password.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether the passwords match, and a new hash to store or None.
+        """
+        return await self._run_password_task(self.pwd_context.verify_and_update, plain_password, hashed_password)
+
+    async def get_password_hash(self, password: str):
         """
         Generate a hash for the given password.
 
@@ -43,7 +96,33 @@ class Auth:
         Returns:
             str: Hashed password.
         """
-        return self.pwd_context.hash(password)
+        return await self._run_password_task(self.pwd_context.hash, password)
+
+    def decode_token(self, token: str) -> dict:
+        """
+        Verify a token and return its payload, reusing earlier verifications of the same token.
+
+        Verified payloads are cached by the SHA-256 of the token until the token's ``exp``, so a token that
+        is sent repeatedly is only decoded once. Invalid tokens are never cached.
+
+        Args:
+            token (str): Encoded token.
+
+        Returns:
+            dict: The verified token payload.
+
+        Raises:
+            JWTError: If the token is invalid or expired.
+        """
+        key = hashlib.sha256(token.encode()).digest()
+        payload = self.token_cache.get(key)
+        if payload is not None:
+            return payload
+        payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+        ttl = payload.get("exp", 0) - time.time()
+        if ttl > 0:
+            self.token_cache.set(key, payload, ttl=ttl)
+        return payload
 
     async def create_access_token(self, data: dict, expires_delta: Optional[float] = None):
         """
@@ -103,8 +182,7 @@ class Auth:
             HTTPException: If the token is invalid or the scope is not 'refresh_token'.
         """
         try:
-            payload = jwt.decode(
-                refresh_token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = self.decode_token(refresh_token)
             if payload['scope'] == 'refresh_token':
                 email = payload['sub']
                 return email
@@ -114,13 +192,15 @@ class Auth:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                 detail='Could not validate credentials')
 
-    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
         """
         Retrieve the current authenticated user.
 
+        Users are served from ``user_cache`` when possible, so most requests do not query the users table.
+
         Args:
             token (str, optional): Access token. Defaults to Depends(oauth2_scheme).
-            db (Session, optional): Database session. Defaults to Depends(get_db).
+            db (AsyncSession, optional): Database session. Defaults to Depends(get_db).
 
         Returns:
             User: Current authenticated user.
@@ -135,8 +215,7 @@ class Auth:
         )
 
         try:
-            payload = jwt.decode(token, self.SECRET_KEY,
-                                 algorithms=[self.ALGORITHM])
+            payload = self.decode_token(token)
             if payload['scope'] == 'access_token':
                 email = payload["sub"]
                 if email is None:
@@ -146,9 +225,12 @@ class Auth:
         except JWTError as e:
             raise credentials_exception
 
-        user = await repository_users.get_user_by_email(email, db)
+        version, user = await user_cache.get(email)
         if user is None:
-            raise credentials_exception
+            user = await repository_users.get_user_by_email(email, db)
+            if user is None:
+                raise credentials_exception
+            user = await user_cache.set(user, version)
         return user
 
     def create_email_token(self, data: dict):
@@ -181,7 +263,7 @@ class Auth:
             HTTPException: If the token is invalid.
         """
         try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = self.decode_token(token)
             email = payload["sub"]
             return email
         except JWTError as e:
@@ -0,0 +1,201 @@
+import asyncio
+import io
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import cloudinary
+import cloudinary.uploader
+from fastapi import HTTPException, UploadFile, status
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from ..conf.config import settings
+
+
+class AvatarStorage(ABC):
+    """
+    Destination of processed avatars.
+
+    ``save`` is blocking and is only called on the avatar worker pool.
+    """
+
+    def configure(self) -> None:
+        """
+        Prepares the storage client once, at application startup.
+        """
+
+    @abstractmethod
+    def save(self, key: str, image: BinaryIO) -> str:
+        """
+        Stores an avatar, replacing any previous one with the same key.
+
+        Args:
+            key (str): The avatar key, e.g. ``contacts/username``.
+            image (BinaryIO): The JPEG image, positioned at its start.
+
+        Returns:
+            str: The public URL of the stored avatar.
+        """
+
+
+class CloudinaryAvatarStorage(AvatarStorage):
+    """
+    Stores avatars on Cloudinary, under the key as public ID.
+    """
+
+    def __init__(self, cloud_name: str, api_key: str, api_secret: str):
+        self.cloud_name = cloud_name
+        self.api_key = api_key
+        self.api_secret = api_secret
+
+    def configure(self) -> None:
+        cloudinary.config(cloud_name=self.cloud_name, api_key=self.api_key, api_secret=self.api_secret, secure=True)
+
+    def save(self, key: str, image: BinaryIO) -> str:
+        result = cloudinary.uploader.upload(image, public_id=key, overwrite=True, resource_type="image")
+        return result["secure_url"]
+
+
+class LocalAvatarStorage(AvatarStorage):
+    """
+    Stores avatars as files below a directory, served under ``base_url``.
+    """
+
+    def __init__(self, root: Path, base_url: str, chunk_size: int = 64 * 1024):
+        self.root = Path(root).resolve()
+        self.base_url = base_url.rstrip("/")
+        self.chunk_size = chunk_size
+
+    def configure(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def save(self, key: str, image: BinaryIO) -> str:
+        path = (self.root / f"{key}.jpg").resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Invalid avatar key: {key}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written next to the target and renamed, so readers never see a partially written avatar.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while chunk := image.read(self.chunk_size):
+                    out.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return f"{self.base_url}/{path.relative_to(self.root).as_posix()}?v={time.time_ns() // 1_000_000}"
+
+
+def resize_avatar(source: BinaryIO, size: int = 250, quality: int = 85) -> io.BytesIO:
+    """
+    Crops an image to a centered square, scales it to ``size`` pixels and encodes it as a progressive JPEG.
+
+    JPEG sources are decoded at a reduced scale when they are much larger than the target, which cuts the
+    decoding time and memory of camera photos.
+
+    Args:
+        source (BinaryIO): The uploaded image.
+        size (int, optional): The width and height of the avatar.
+        quality (int, optional): The JPEG quality.
+
+    Raises:
+        PIL.UnidentifiedImageError: If the source is not an image.
+        PIL.Image.DecompressionBombError: If the image has too many pixels.
+
+    Returns:
+        io.BytesIO: The JPEG avatar, positioned at its start.
+    """
+    with Image.open(source) as image:
+        image.draft("RGB", (size * 2, size * 2))
+        image = ImageOps.exif_transpose(image)
+        avatar = ImageOps.fit(image.convert("RGB"), (size, size), method=Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    avatar.save(output, format="JPEG", quality=quality, optimize=True, progressive=True)
+    output.seek(0)
+    return output
+
+
+class AvatarService:
+    """
+    Avatar pipeline: local resize and compression followed by the upload to the configured storage.
+
+    Both steps block, so they run together on a dedicated, size-limited thread pool and never on the event
+    loop. When more than ``max_pending`` avatars are queued, new ones are rejected with 503.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 16, size: int = 250, quality: int = 85,
+                 max_bytes: int = 10 * 1024 * 1024):
+        self.storage: Optional[AvatarStorage] = None
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="avatar")
+        self.max_pending = max_pending
+        self.pending = 0
+        self.size = size
+        self.quality = quality
+        self.max_bytes = max_bytes
+
+    def init(self, storage: AvatarStorage) -> None:
+        """
+        Configures the storage and enables the service.
+
+        Args:
+            storage (AvatarStorage): Where avatars are stored.
+        """
+        storage.configure()
+        self.storage = storage
+
+    def _process(self, source: BinaryIO, key: str) -> str:
+        return self.storage.save(key, resize_avatar(source, self.size, self.quality))
+
+    async def update(self, file: UploadFile, key: str) -> str:
+        """
+        Resizes an uploaded image and stores it as an avatar.
+
+        Args:
+            file (UploadFile): The uploaded image, spooled to disk by the multipart parser.
+            key (str): The avatar key.
+
+        Raises:
+            HTTPException: If the file is too large or not an image, or if the pipeline is busy or not
+                configured.
+
+        Returns:
+            str: The public URL of the avatar.
+        """
+        if self.storage is None:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="Avatar storage is not configured")
+        if file.size is not None and file.size > self.max_bytes:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Image is too large")
+        if self.pending >= self.max_pending:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="Server is busy, try again later")
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self._process, file.file, key)
+        except (UnidentifiedImageError, Image.DecompressionBombError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid image")
+        finally:
+            self.pending -= 1
+
+
+def create_avatar_storage() -> AvatarStorage:
+    """
+    Creates the avatar storage selected by the ``avatar_storage`` setting.
+
+    Returns:
+        AvatarStorage: The Cloudinary storage, or the local filesystem storage for ``local``.
+    """
+    if settings.avatar_storage == "local":
+        return LocalAvatarStorage(Path(settings.avatar_local_dir), settings.avatar_local_url)
+    return CloudinaryAvatarStorage(settings.cloudinary_name, settings.cloudinary_api_key,
+                                   settings.cloudinary_api_secret)
+
+
+avatar_service = AvatarService(workers=settings.avatar_workers, max_pending=settings.avatar_max_pending,
+                               size=settings.avatar_size, quality=settings.avatar_quality,
+                               max_bytes=settings.avatar_max_bytes)
@@ -0,0 +1,357 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple, Union
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from ..conf.config import settings
+from ..database.models import User
+from ..schemas import UserDb
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Bounded in-process cache with least-recently-used eviction and per-entry expiry.
+
+    Attributes:
+        hits (int): Number of lookups that found a live entry.
+        misses (int): Number of lookups that found no entry or an expired one.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns the cached value, or None if it is missing or expired.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Any: The cached value, or None.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores a value, evicting the least recently used entries above ``maxsize``.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to store.
+            ttl (float, optional): Lifetime of the entry in seconds. Defaults to the cache TTL.
+        """
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Removes an entry if present.
+
+        Args:
+            key (Hashable): The cache key.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache size and hit/miss counters.
+
+        Returns:
+            dict: The number of entries, hits and misses.
+        """
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class ContactCache:
+    """
+    Redis cache of serialized contact responses, scoped per user.
+
+    Every entry key embeds the user's current cache version. Writes bump the version, which makes all of the
+    user's entries unreachable at once; the orphaned entries expire through their TTL. A reader stores the
+    payload under the version it read before querying the database, so a write that lands in between can
+    never be hidden behind a stale entry.
+
+    The cache is disabled until ``init`` is called and degrades to a miss on Redis errors.
+    """
+
+    def __init__(self, ttl: int = 300, prefix: str = "contacts"):
+        self.redis: Optional[Redis] = None
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def init(self, redis: Redis) -> None:
+        """
+        Enables the cache.
+
+        Args:
+            redis (Redis): The Redis client to store entries in.
+        """
+        self.redis = redis
+
+    def _version_key(self, user_id: int) -> str:
+        return f"{self.prefix}:{user_id}:version"
+
+    def _seed_version(self, pipe, user_id: int) -> None:
+        # A missing version (first use or eviction) starts from the clock, so it never repeats an old version.
+        pipe.set(self._version_key(user_id), time.time_ns() // 1_000_000, nx=True)
+
+    def _entry_key(self, user_id: int, version: str, key: str) -> str:
+        return f"{self.prefix}:{user_id}:{version}:{key}"
+
+    async def get(self, user_id: int, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Looks up a cached payload.
+
+        Args:
+            user_id (int): The owner of the cached contacts.
+            key (str): The entry key, e.g. ``contact:1``.
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: The user's cache version to pass to ``set`` and the cached
+            payload, or None for the payload on a miss. The version is None when the cache is unavailable.
+        """
+        if self.redis is None:
+            return None, None
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                self._seed_version(pipe, user_id)
+                pipe.get(self._version_key(user_id))
+                _, version = await pipe.execute()
+            if version is None:
+                return None, None
+            if isinstance(version, bytes):
+                version = version.decode()
+            return str(version), await self.redis.get(self._entry_key(user_id, version, key))
+        except RedisError as err:
+            logger.warning("Contact cache read failed: %s", err)
+            return None, None
+
+    async def set(self, user_id: int, version: Optional[str], key: str, payload: bytes) -> None:
+        """
+        Stores a payload under the version returned by ``get``.
+
+        Args:
+            user_id (int): The owner of the cached contacts.
+            version (str, optional): The version returned by ``get``; nothing is stored when None.
+            key (str): The entry key.
+            payload (bytes): The serialized response.
+        """
+        if self.redis is None or version is None:
+            return
+        try:
+            await self.redis.set(self._entry_key(user_id, version, key), payload, ex=self.ttl)
+        except RedisError as err:
+            logger.warning("Contact cache write failed: %s", err)
+
+    async def get_response(self, user_id: int, key: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Looks up a payload stored together with its ETag by ``set_response``.
+
+        Args:
+            user_id (int): The owner of the cached contacts.
+            key (str): The entry key.
+
+        Returns:
+            Tuple[Optional[str], Optional[str], Optional[str]]: The user's cache version, and the ETag and
+            payload, which are None on a miss.
+        """
+        version, entry = await self.get(user_id, key)
+        if entry is None:
+            return version, None, None
+        if isinstance(entry, bytes):
+            entry = entry.decode()
+        etag, _, payload = entry.partition("\n")
+        return version, etag, payload
+
+    async def set_response(self, user_id: int, version: Optional[str], key: str, etag: str,
+                           payload: Union[str, bytes]) -> None:
+        """
+        Stores a payload together with its ETag, so that a cache hit can still send the ETag.
+
+        Args:
+            user_id (int): The owner of the cached contacts.
+            version (str, optional): The version returned by ``get_response``; nothing is stored when None.
+            key (str): The entry key.
+            etag (str): The ETag of the payload.
+            payload (str | bytes): The serialized response.
+        """
+        if isinstance(payload, bytes):
+            payload = payload.decode()
+        await self.set(user_id, version, key, f"{etag}\n{payload}")
+
+    async def invalidate(self, user_id: int) -> None:
+        """
+        Invalidates every cached entry of a user by bumping the user's version.
+
+        Args:
+            user_id (int): The owner of the changed contacts.
+        """
+        if self.redis is None:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                self._seed_version(pipe, user_id)
+                pipe.incr(self._version_key(user_id))
+                await pipe.execute()
+        except RedisError as err:
+            logger.warning("Contact cache invalidation failed: %s", err)
+
+
+class UserCache:
+    """
+    Cache of authenticated users keyed by the token subject (the user's email).
+
+    Users are kept in a bounded in-process LRU and, once ``init`` is called, in Redis so that workers share
+    lookups. Cached users are detached copies carrying the public profile fields of ``UserDb``; password
+    hashes and refresh tokens are never cached. Another worker's in-process copy may stay stale for at most
+    ``local_ttl`` seconds after an invalidation.
+
+    As in ``ContactCache``, Redis entries are keyed by a per-user version that invalidations bump, and a
+    reader stores the user under the version ``get`` returned before the database was queried. A profile read
+    before a concurrent invalidation is therefore never served afterwards; the in-process tier skips such a
+    write the same way, using a counter of local invalidations.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 300, local_ttl: int = 30, prefix: str = "users"):
+        self.local = LRUCache(maxsize, local_ttl)
+        self.redis: Optional[Redis] = None
+        self.ttl = ttl
+        self.prefix = prefix
+        self._invalidations = 0
+
+    def init(self, redis: Redis) -> None:
+        """
+        Enables the shared Redis tier.
+
+        Args:
+            redis (Redis): The Redis client to store users in.
+        """
+        self.redis = redis
+
+    def _version_key(self, email: str) -> str:
+        return f"{self.prefix}:{email}:version"
+
+    def _seed_version(self, pipe, email: str) -> None:
+        # A missing version (first use or eviction) starts from the clock, so it never repeats an old version.
+        pipe.set(self._version_key(email), time.time_ns() // 1_000_000, nx=True)
+
+    def _key(self, email: str, version: str) -> str:
+        return f"{self.prefix}:{email}:{version}"
+
+    async def get(self, email: str) -> Tuple[Optional[tuple], Optional[User]]:
+        """
+        Looks up a cached user.
+
+        Args:
+            email (str): The token subject.
+
+        Returns:
+            Tuple[Optional[tuple], Optional[User]]: The version to pass to ``set`` after loading the user from
+            the database, and a detached User, or None on a miss.
+        """
+        user = self.local.get(email)
+        if user is not None:
+            return None, user
+        version = (self._invalidations, None)
+        if self.redis is None:
+            return version, None
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                self._seed_version(pipe, email)
+                pipe.get(self._version_key(email))
+                _, redis_version = await pipe.execute()
+            if isinstance(redis_version, bytes):
+                redis_version = redis_version.decode()
+            version = (version[0], redis_version)
+            payload = await self.redis.get(self._key(email, redis_version))
+        except RedisError as err:
+            logger.warning("User cache read failed: %s", err)
+            return version, None
+        if payload is None:
+            return version, None
+        user = User(**UserDb.model_validate_json(payload).model_dump())
+        if self._invalidations == version[0]:
+            self.local.set(email, user)
+        return version, user
+
+    async def set(self, user: User, version: Optional[tuple]) -> User:
+        """
+        Caches a detached copy of a user under the version returned by ``get``.
+
+        Nothing is stored in a tier that was invalidated since ``get``.
+
+        Args:
+            user (User): The user loaded from the database.
+            version (tuple, optional): The version returned by ``get``; nothing is stored when None.
+
+        Returns:
+            User: The cached copy.
+        """
+        profile = UserDb.model_validate(user, from_attributes=True)
+        cached = User(**profile.model_dump())
+        if version is None:
+            return cached
+        invalidations, redis_version = version
+        if invalidations == self._invalidations:
+            self.local.set(user.email, cached)
+        if self.redis is not None and redis_version is not None:
+            try:
+                await self.redis.set(self._key(user.email, redis_version), profile.model_dump_json(), ex=self.ttl)
+            except RedisError as err:
+                logger.warning("User cache write failed: %s", err)
+        return cached
+
+    async def invalidate(self, email: str) -> None:
+        """
+        Drops a cached user by bumping the user's version.
+
+        Args:
+            email (str): The user's email.
+        """
+        self._invalidations += 1
+        self.local.delete(email)
+        if self.redis is not None:
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    self._seed_version(pipe, email)
+                    pipe.incr(self._version_key(email))
+                    await pipe.execute()
+            except RedisError as err:
+                logger.warning("User cache invalidation failed: %s", err)
+
+
+contact_cache = ContactCache(ttl=settings.contact_cache_ttl)
+user_cache = UserCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl,
+                       local_ttl=settings.user_cache_local_ttl)
@@ -0,0 +1,325 @@
+import codecs
+import csv
+import io
+import json
+import zlib
+from datetime import date
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+import orjson
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database.db import SessionLocal
+from ..database.models import User
+from ..repository import contacts as repository_contacts
+from ..schemas import ContactModel, ContactResponse, contact_response_model
+
+Record = Tuple[int, Optional[dict], Optional[str]]
+
+CONTACT_FIELDS = list(ContactResponse.model_fields)
+EXPORT_CHUNK_SIZE = 64 * 1024
+MAX_CSV_RECORD_SIZE = 64 * 1024
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Decodes a stream of UTF-8 byte chunks into lines without buffering the whole stream.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw byte chunks, e.g. ``Request.stream()``.
+
+    Yields:
+        str: Each line, including its ``\n`` terminator except possibly for the last one.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _ends_in_quotes(line: str, quoted: bool) -> bool:
+    # Follows the quoting rules of csv.reader: a quote only opens a quoted field at the start of a field,
+    # so a stray quote such as O"Brien is part of an unquoted value.
+    field_start = not quoted
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if quoted:
+            if char == '"':
+                if line[i + 1:i + 2] == '"':
+                    i += 1
+                else:
+                    quoted = False
+        elif char == '"' and field_start:
+            quoted = True
+        field_start = not quoted and char in ',\r\n'
+        i += 1
+    return quoted
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes],
+                           max_record_size: int = MAX_CSV_RECORD_SIZE) -> AsyncIterator[Record]:
+    """
+    Parses a streamed CSV file with a header row into records.
+
+    Quoted fields may span several lines. A record that grows beyond ``max_record_size`` characters, e.g.
+    because of an unterminated quoted field, is reported as an error and parsing resumes at the next line.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw byte chunks.
+        max_record_size (int, optional): Maximum length of a single record, in characters.
+
+    Yields:
+        Tuple[int, Optional[dict], Optional[str]]: The 1-based data row number, the record keyed by the
+        header, and a parse error if the row could not be read.
+    """
+    header = None
+    row = 0
+    buffer = ""
+    quoted = False
+    async for line in iter_lines(chunks):
+        buffer += line
+        quoted = _ends_in_quotes(line, quoted)
+        if quoted:
+            if len(buffer) > max_record_size:
+                row += 1
+                yield row, None, "Record is too long"
+                buffer, quoted = "", False
+            continue
+        record, buffer = buffer, ""
+        if not record.strip():
+            continue
+        try:
+            fields = next(csv.reader([record]))
+        except csv.Error as err:
+            row += 1
+            yield row, None, str(err)
+            continue
+        if header is None:
+            header = [field.strip() for field in fields]
+            continue
+        row += 1
+        if len(fields) != len(header):
+            yield row, None, f"Expected {len(header)} fields, got {len(fields)}"
+            continue
+        yield row, {key: value or None for key, value in zip(header, fields)}, None
+    if buffer.strip():
+        yield row + 1, None, "Unterminated quoted field"
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """
+    Parses a streamed NDJSON file into records, one JSON object per line.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw byte chunks.
+
+    Yields:
+        Tuple[int, Optional[dict], Optional[str]]: The 1-based line number, the decoded object, and a parse
+        error if the line is not a JSON object.
+    """
+    row = 0
+    async for line in iter_lines(chunks):
+        row += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as err:
+            yield row, None, f"Invalid JSON: {err.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Expected a JSON object"
+            continue
+        yield row, record, None
+
+
+async def import_contacts(records: AsyncIterator[Record], user: User, db: AsyncSession,
+                          batch_size: int = 500, max_errors: int = 1000) -> dict:
+    """
+    Validates streamed records with ``ContactModel`` and inserts them in batches.
+
+    Each batch is a single multi-row INSERT committed on its own, so memory use is bounded by the batch
+    size and rows imported before a failure are kept.
+
+    Args:
+        records (AsyncIterator[Record]): Records produced by ``iter_csv_records`` or ``iter_ndjson_records``.
+        user (User): The user who owns the contacts.
+        db (AsyncSession): The database session.
+        batch_size (int, optional): Number of valid rows per INSERT.
+        max_errors (int, optional): Maximum number of row errors to report.
+
+    Returns:
+        dict: The import report with ``total``, ``inserted`` and ``failed`` counts and the per-row ``errors``.
+    """
+    report = {"total": 0, "inserted": 0, "failed": 0, "errors": [], "errors_truncated": False}
+    batch: List[Tuple[int, ContactModel]] = []
+
+    def add_error(row: int, errors: List[str]) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"row": row, "errors": errors})
+        else:
+            report["errors_truncated"] = True
+
+    async def flush() -> None:
+        ids = await repository_contacts.create_contacts([body for _, body in batch], user, db)
+        for (row, _), contact_id in zip(batch, ids):
+            if contact_id is None:
+                add_error(row, ["Contact with this email already exists"])
+            else:
+                report["inserted"] += 1
+        batch.clear()
+
+    async for row, record, error in records:
+        report["total"] += 1
+        if error is not None:
+            add_error(row, [error])
+            continue
+        try:
+            batch.append((row, ContactModel(**record)))
+        except ValidationError as err:
+            add_error(row, [f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in err.errors()])
+            continue
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return report
+
+
+def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parses a sparse fieldset parameter such as ``name,phone_number``.
+
+    Args:
+        value (str, optional): Comma-separated ``ContactResponse`` field names.
+
+    Raises:
+        ValueError: If an unknown field is requested.
+
+    Returns:
+        Tuple[str, ...]: The requested fields plus ``id``, in response order, or None to return every field.
+    """
+    if not value:
+        return None
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = requested.difference(CONTACT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return tuple(field for field in CONTACT_FIELDS if field in requested)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(fields: Optional[Tuple[str, ...]]) -> TypeAdapter:
+    return TypeAdapter(List[ContactResponse if fields is None else contact_response_model(fields)])
+
+
+def serialize_contacts(contacts: Sequence, fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    """
+    Validates contacts through the response model and encodes them as a JSON array.
+
+    Args:
+        contacts (Sequence): Contact objects, or rows selected with ``fields``.
+        fields (Tuple[str, ...], optional): The sparse fieldset from ``parse_fields``.
+
+    Returns:
+        bytes: The JSON array.
+    """
+    adapter = _list_adapter(fields)
+    return adapter.dump_json(adapter.validate_python(contacts, from_attributes=True))
+
+
+def dump_contacts(rows: Sequence[Row]) -> bytes:
+    """
+    Encodes contact rows straight to a JSON array, without building response models.
+
+    The rows must have been selected with the columns of ``CONTACT_FIELDS`` or of a sparse fieldset (see the
+    ``fields`` argument of the repository functions). Their values were validated when they were written, so the
+    output is the same as that of ``serialize_contacts``, at a fraction of the cost.
+
+    Args:
+        rows (Sequence[Row]): The selected contact rows.
+
+    Returns:
+        bytes: The JSON array.
+    """
+    return orjson.dumps([row._asdict() for row in rows])
+
+
+def dump_contact_page(items: bytes, next_cursor: Optional[str]) -> bytes:
+    """
+    Wraps an encoded contact list into a ``ContactPage`` JSON object.
+
+    Args:
+        items (bytes): The JSON array from ``serialize_contacts`` or ``dump_contacts``.
+        next_cursor (str, optional): The cursor of the next page.
+
+    Returns:
+        bytes: The JSON object.
+    """
+    return b'{"items":' + items + b',"next_cursor":' + orjson.dumps(next_cursor) + b"}"
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def export_contacts(user: User, format: str = "ndjson", compress: bool = False,
+                          batch_size: int = 1000) -> AsyncIterator[bytes]:
+    """
+    Serializes all contacts of a user as CSV or NDJSON, streamed in chunks.
+
+    Contacts are read from a server-side cursor in a session owned by the generator, because the request's
+    session is closed before a streaming response body is sent. The field set is the one of
+    ``ContactResponse``.
+
+    Args:
+        user (User): The user whose contacts are exported.
+        format (str, optional): ``ndjson`` or ``csv``.
+        compress (bool, optional): Whether to gzip the output.
+        batch_size (int, optional): Number of rows fetched from the cursor per round trip.
+
+    Yields:
+        bytes: Chunks of the (optionally gzipped) export.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if format == "csv" else None
+    if writer is not None:
+        writer.writerow(CONTACT_FIELDS)
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor is not None else data
+
+    async with SessionLocal() as db:
+        async for row in repository_contacts.stream_contacts(user, db, CONTACT_FIELDS, batch_size):
+            if writer is not None:
+                writer.writerow(row)
+            else:
+                buffer.write(json.dumps(row._asdict(), default=_json_default, ensure_ascii=False))
+                buffer.write("\n")
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                chunk = drain()
+                if chunk:
+                    yield chunk
+    chunk = drain()
+    if compressor is not None:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
@@ -1,27 +1,202 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from email.utils import formataddr
 from pathlib import Path
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from fastapi_mail.errors import ConnectionErrors
+import aiosmtplib
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pydantic import EmailStr
 
 from ..services.auth import auth_service
 from ..conf.config import settings
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.mail_username,
-    MAIL_PASSWORD=settings.mail_password,
-    MAIL_FROM=settings.mail_from,
-    MAIL_PORT=settings.mail_port,
-    MAIL_SERVER=settings.mail_server,
-    MAIL_FROM_NAME="Rest API",
-    MAIL_STARTTLS=True,
-    MAIL_SSL_TLS=False,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True,
-    TEMPLATE_FOLDER=Path(__file__).parent / "templates",
+logger = logging.getLogger(__name__)
+
+TEMPLATE_FOLDER = Path(__file__).parent / "templates"
+
+
+class MailSender:
+    """
+    Long-lived mail sender with a pool of authenticated SMTP connections and compiled templates.
+
+    Up to ``pool_size`` connections are opened on demand and kept open between messages, so the TCP, TLS and
+    AUTH handshakes are paid once per connection instead of once per message. Connections idle for longer
+    than ``max_idle`` seconds, or that failed, are closed rather than reused. Templates are compiled once by
+    the Jinja environment and served from its cache afterwards.
+    """
+
+    def __init__(self, hostname: str, port: int, username: Optional[str], password: Optional[str], sender: str,
+                 sender_name: Optional[str] = None, start_tls: bool = True, use_tls: bool = False,
+                 validate_certs: bool = True, pool_size: int = 4, timeout: float = 60, max_idle: float = 30,
+                 template_folder: Path = TEMPLATE_FOLDER):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = formataddr((sender_name, sender)) if sender_name else sender
+        self.start_tls = start_tls
+        self.use_tls = use_tls
+        self.validate_certs = validate_certs
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.templates = Environment(loader=FileSystemLoader(template_folder),
+                                     autoescape=select_autoescape(["html", "xml"]))
+        self._slots = asyncio.Semaphore(pool_size)
+        self._idle: List[Tuple[float, aiosmtplib.SMTP]] = []
+
+    def render(self, template_name: str, **context) -> str:
+        """
+        Renders a template from the template folder.
+
+        Args:
+            template_name (str): The template file name.
+            **context: The template variables.
+
+        Returns:
+            str: The rendered template.
+        """
+        return self.templates.get_template(template_name).render(**context)
+
+    def build_message(self, recipient: str, subject: str, html: str) -> EmailMessage:
+        """
+        Builds an HTML message from the configured sender.
+
+        Args:
+            recipient (str): Email address of the recipient.
+            subject (str): The subject line.
+            html (str): The HTML body.
+
+        Returns:
+            EmailMessage: The message.
+        """
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.set_content(html, subtype="html")
+        return message
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(hostname=self.hostname, port=self.port, username=self.username,
+                               password=self.password, use_tls=self.use_tls, start_tls=self.start_tls,
+                               validate_certs=self.validate_certs, timeout=self.timeout)
+        await smtp.connect()
+        return smtp
+
+    async def _checkout(self) -> Tuple[aiosmtplib.SMTP, bool]:
+        while self._idle:
+            released, smtp = self._idle.pop()
+            if smtp.is_connected and time.monotonic() - released < self.max_idle:
+                return smtp, True
+            smtp.close()
+        return await self._connect(), False
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Tuple[aiosmtplib.SMTP, bool]]:
+        """
+        Checks out a connection, waiting while ``pool_size`` connections are in use.
+
+        The connection goes back to the pool when the block exits normally and is closed when it raises.
+
+        Yields:
+            Tuple[aiosmtplib.SMTP, bool]: The connected client and whether it was reused from the pool.
+        """
+        async with self._slots:
+            smtp, reused = await self._checkout()
+            try:
+                yield smtp, reused
+            except BaseException:
+                smtp.close()
+                raise
+            self._idle.append((time.monotonic(), smtp))
+
+    async def send_many(self, messages: Sequence[EmailMessage]) -> None:
+        """
+        Sends messages one after another over a single connection.
+
+        A pooled connection that the server has closed in the meantime is replaced, and the messages
+        that were not sent yet are sent over the new connection.
+
+        Args:
+            messages (Sequence[EmailMessage]): The messages to send.
+
+        Raises:
+            aiosmtplib.SMTPException: If the server rejects a message or cannot be reached.
+        """
+        pending = list(messages)
+        while pending:
+            reused = False
+            try:
+                async with self.connection() as (smtp, reused):
+                    while pending:
+                        await smtp.send_message(pending[0])
+                        pending.pop(0)
+            except aiosmtplib.SMTPServerDisconnected:
+                if not reused:
+                    raise
+                logger.info("Pooled SMTP connection was closed by the server, reconnecting")
+
+    async def send(self, message: EmailMessage) -> None:
+        """
+        Sends a single message over a pooled connection.
+
+        Args:
+            message (EmailMessage): The message to send.
+
+        Raises:
+            aiosmtplib.SMTPException: If the server rejects the message or cannot be reached.
+        """
+        await self.send_many([message])
+
+    async def close(self) -> None:
+        """
+        Closes all idle connections.
+        """
+        while self._idle:
+            _, smtp = self._idle.pop()
+            try:
+                await smtp.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                smtp.close()
+
+
+mail_sender = MailSender(
+    hostname=settings.mail_server,
+    port=settings.mail_port,
+    username=settings.mail_username if settings.mail_use_credentials else None,
+    password=settings.mail_password if settings.mail_use_credentials else None,
+    sender=settings.mail_from,
+    sender_name="Rest API",
+    start_tls=settings.mail_starttls,
+    use_tls=settings.mail_ssl_tls,
+    validate_certs=settings.mail_validate_certs,
+    pool_size=settings.mail_pool_size,
+    timeout=settings.mail_timeout,
+    max_idle=settings.mail_max_idle,
 )
 
 
+def verification_message(email: EmailStr, username: str, host: str) -> EmailMessage:
+    """
+    Builds the email verification message.
+
+    Args:
+        email (EmailStr): Email address of the recipient.
+        username (str): Username of the recipient.
+        host (str): Host URL for the verification link.
+
+    Returns:
+        EmailMessage: The message.
+    """
+    token_verification = auth_service.create_email_token({"sub": email})
+    html = mail_sender.render("email_template.html", host=host, username=username, token=token_verification)
+    return mail_sender.build_message(email, "Confirm your email", html)
+
+
 async def send_email(email: EmailStr, username: str, host: str):
     """
     Send an email for email verification.
@@ -32,22 +207,6 @@ async def send_email(email: EmailStr, username: str, host: str):
         host (str): Host URL for the verification link.
 
     Raises:
-        ConnectionErrors: If there is an error connecting to the email server.
+        aiosmtplib.SMTPException: If there is an error connecting to the email server.
     """
-    try:
-        token_verification = auth_service.create_email_token({"sub": email})
-        message = MessageSchema(
-            subject="Confirm your email",
-            recipients=[email],
-            template_body={
-                "host": host,
-                "username": username,
-                "token": token_verification,
-            },
-            subtype=MessageType.html,
-        )
-
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="email_template.html")
-    except ConnectionErrors as err:
-        print(err)
+    await mail_sender.send(verification_message(email, username, host))
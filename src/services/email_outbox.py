@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from ..conf.config import settings
+
+logger = logging.getLogger(__name__)
+
+Entry = Tuple[str, Dict[str, str]]
+Sender = Callable[[Dict[str, str]], Awaitable[None]]
+
+
+def _entry_age(entry_id: str) -> float:
+    # Stream entry IDs start with the Redis time of the XADD in milliseconds.
+    return max(time.time() - int(entry_id.split("-")[0]) / 1000, 0)
+
+
+class EmailOutbox:
+    """
+    Durable queue of outgoing emails on a Redis stream, drained by ``email_worker.py``.
+
+    Web workers only append messages to the stream. Workers read them through a consumer group in batches and
+    acknowledge each one once it is sent, so a message survives restarts of both the web and the worker
+    processes. A message that failed, or whose worker died, stays pending and is claimed again once it has
+    been idle for ``retry_base * 2 ** (deliveries - 1)`` seconds. After ``max_attempts`` deliveries it is
+    moved to the dead-letter stream, which keeps about the last ``dead_maxlen`` of them. The outbox stream itself
+    is never trimmed, because trimming would drop messages that have not been sent yet; sent messages are deleted
+    from it instead.
+
+    Counters are kept in a Redis hash so that ``stats`` reports the throughput of all workers. Reads block for
+    at most ``block_ms``, which must stay below the Redis socket timeout.
+
+    The outbox is disabled until ``init`` is called.
+    """
+
+    def __init__(self, batch_size: int = 50, block_ms: int = 1000, max_attempts: int = 5,
+                 retry_base: float = 30, dead_maxlen: int = 100000, prefix: str = "email:outbox"):
+        self.redis: Optional[Redis] = None
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.dead_maxlen = dead_maxlen
+        self.stream = prefix
+        self.dead_stream = f"{prefix}:dead"
+        self.metrics_key = f"{prefix}:metrics"
+        self.group = "email-workers"
+        self._scan_from = "-"
+
+    def init(self, redis: Redis) -> None:
+        """
+        Enables the outbox.
+
+        Args:
+            redis (Redis): The Redis client holding the stream.
+        """
+        self.redis = redis
+
+    def backoff(self, deliveries: int) -> float:
+        """
+        Returns how long a message must stay idle before it is delivered again.
+
+        Args:
+            deliveries (int): How many times the message has been delivered.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        return self.retry_base * 2 ** (deliveries - 1)
+
+    async def enqueue(self, email: str, username: str, host: str) -> bool:
+        """
+        Queues an email verification message.
+
+        Args:
+            email (str): Email address of the recipient.
+            username (str): Username of the recipient.
+            host (str): Host URL for the verification link.
+
+        Returns:
+            bool: True if the message was queued, False if the outbox is disabled or Redis is unavailable.
+        """
+        if self.redis is None:
+            return False
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.xadd(self.stream, {"email": email, "username": username, "host": str(host)})
+                pipe.hincrby(self.metrics_key, "enqueued", 1)
+                await pipe.execute()
+        except RedisError as err:
+            logger.warning("Email outbox unavailable: %s", err)
+            return False
+        return True
+
+    async def ensure_group(self) -> None:
+        """
+        Creates the stream and its consumer group if they do not exist yet.
+        """
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as err:
+            if "BUSYGROUP" not in str(err):
+                raise
+
+    async def read(self, consumer: str) -> List[Entry]:
+        """
+        Reads a batch of new messages, waiting up to ``block_ms`` for the first one.
+
+        Args:
+            consumer (str): The name of this worker in the consumer group.
+
+        Returns:
+            List[Tuple[str, Dict[str, str]]]: The entry IDs and messages.
+        """
+        streams = await self.redis.xreadgroup(self.group, consumer, {self.stream: ">"},
+                                              count=self.batch_size, block=self.block_ms)
+        return [entry for _, entries in streams or [] for entry in entries]
+
+    async def claim_due(self, consumer: str) -> List[Entry]:
+        """
+        Claims the pending messages whose backoff has elapsed and dead-letters those out of attempts.
+
+        Each call checks the next ``batch_size`` pending messages, continuing after the last one checked by the
+        previous call, so messages still backing off at the head of the list do not hide due ones behind them.
+
+        Args:
+            consumer (str): The name of this worker in the consumer group.
+
+        Returns:
+            List[Tuple[str, Dict[str, str]]]: The entry IDs and messages to deliver again.
+        """
+        # Messages idle for less than the first backoff are never due, so Redis skips them.
+        pending = await self.redis.xpending_range(self.stream, self.group, min=self._scan_from, max="+",
+                                                  count=self.batch_size, idle=int(self.backoff(1) * 1000))
+        self._scan_from = f"({pending[-1]['message_id']}" if len(pending) == self.batch_size else "-"
+        due = defaultdict(list)
+        for item in pending:
+            min_idle = int(self.backoff(item["times_delivered"]) * 1000)
+            if item["time_since_delivered"] >= min_idle:
+                due[(min_idle, item["times_delivered"] >= self.max_attempts)].append(item["message_id"])
+        entries, dead = [], []
+        for (min_idle, exhausted), ids in due.items():
+            # Claiming with the same idle threshold skips messages another worker has claimed meanwhile.
+            claimed = await self.redis.xclaim(self.stream, self.group, consumer, min_idle, ids)
+            (dead if exhausted else entries).extend(entry for entry in claimed if entry[1])
+        if dead:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for _, fields in dead:
+                    pipe.xadd(self.dead_stream, fields, maxlen=self.dead_maxlen, approximate=True)
+                pipe.xack(self.stream, self.group, *[entry_id for entry_id, _ in dead])
+                pipe.xdel(self.stream, *[entry_id for entry_id, _ in dead])
+                pipe.hincrby(self.metrics_key, "dead", len(dead))
+                await pipe.execute()
+            logger.error("Moved %d emails to %s after %d attempts", len(dead), self.dead_stream,
+                         self.max_attempts)
+        if entries:
+            await self.redis.hincrby(self.metrics_key, "retried", len(entries))
+        return entries
+
+    async def process(self, entries: List[Entry], send: Sender) -> int:
+        """
+        Sends a batch of messages concurrently and acknowledges the ones that were sent.
+
+        Failed messages are left pending, to be claimed again by ``claim_due``.
+
+        Args:
+            entries (List[Tuple[str, Dict[str, str]]]): The entry IDs and messages.
+            send (Callable): Coroutine function that sends one message.
+
+        Returns:
+            int: The number of messages sent.
+        """
+        results = await asyncio.gather(*(send(fields) for _, fields in entries), return_exceptions=True)
+        sent = []
+        for (entry_id, fields), result in zip(entries, results):
+            if isinstance(result, Exception):
+                logger.warning("Sending email %s to %s failed: %s", entry_id, fields.get("email"), result)
+            else:
+                sent.append(entry_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            if sent:
+                pipe.xack(self.stream, self.group, *sent)
+                pipe.xdel(self.stream, *sent)
+                pipe.hincrby(self.metrics_key, "sent", len(sent))
+            if len(sent) < len(entries):
+                pipe.hincrby(self.metrics_key, "failed", len(entries) - len(sent))
+            pipe.hincrby(self.metrics_key, "batches", 1)
+            await pipe.execute()
+        return len(sent)
+
+    async def run(self, consumer: str, send: Sender, stop: asyncio.Event) -> None:
+        """
+        Drains the outbox until ``stop`` is set.
+
+        Args:
+            consumer (str): The name of this worker in the consumer group.
+            send (Callable): Coroutine function that sends one message.
+            stop (asyncio.Event): Set to finish the current batch and return.
+        """
+        await self.ensure_group()
+        while not stop.is_set():
+            try:
+                entries = await self.claim_due(consumer)
+                if entries:
+                    await self.process(entries, send)
+                entries = await self.read(consumer)
+                if entries:
+                    await self.process(entries, send)
+            except RedisError as err:
+                logger.warning("Email outbox unavailable: %s", err)
+                await asyncio.sleep(1)
+
+    async def stats(self) -> dict:
+        """
+        Returns the outbox counters and backlog.
+
+        Returns:
+            dict: The ``enqueued``, ``sent``, ``failed``, ``retried``, ``dead`` and ``batches`` counters, the
+            number of ``pending`` (delivered but unacknowledged) and ``unread`` messages, and ``lag_seconds``,
+            the age of the oldest message that has not been sent yet.
+        """
+        empty = {name: 0 for name in ("enqueued", "sent", "failed", "retried", "dead", "batches")}
+        empty.update({"pending": 0, "unread": 0, "lag_seconds": 0.0})
+        if self.redis is None:
+            return empty
+        try:
+            counters = await self.redis.hgetall(self.metrics_key)
+            stats = {**empty, **{name: int(value) for name, value in counters.items()}}
+            await self._add_backlog(stats)
+        except RedisError as err:
+            logger.warning("Email outbox unavailable: %s", err)
+            return empty
+        return stats
+
+    async def _add_backlog(self, stats: dict) -> None:
+        try:
+            groups = await self.redis.xinfo_groups(self.stream)
+        except ResponseError:
+            # The stream does not exist until the first message or worker.
+            return
+        group = next((g for g in groups if g["name"] == self.group), None)
+        if group is None:
+            return
+        oldest = []
+        summary = await self.redis.xpending(self.stream, self.group)
+        stats["pending"] = summary["pending"]
+        if summary["pending"]:
+            oldest.append(summary["min"])
+        unread = await self.redis.xrange(self.stream, min=f"({group['last-delivered-id']}", count=1)
+        if unread:
+            oldest.append(unread[0][0])
+            lag = group.get("lag")
+            stats["unread"] = lag if lag is not None else await self.redis.xlen(self.stream) - summary["pending"]
+        if oldest:
+            stats["lag_seconds"] = max(_entry_age(entry_id) for entry_id in oldest)
+
+
+email_outbox = EmailOutbox(batch_size=settings.email_outbox_batch_size, block_ms=settings.email_outbox_block_ms,
+                           max_attempts=settings.email_outbox_max_attempts,
+                           retry_base=settings.email_outbox_retry_base, dead_maxlen=settings.email_outbox_dead_maxlen)
@@ -0,0 +1,76 @@
+from typing import Optional
+
+
+def make_etag(*parts) -> str:
+    """
+    Builds a strong ETag from version components.
+
+    Args:
+        *parts: Values identifying the representation, e.g. a contact version.
+
+    Returns:
+        str: The quoted ETag, e.g. ``"3"``.
+    """
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def parse_etags(header: Optional[str]) -> list:
+    """
+    Parses an ``If-Match`` or ``If-None-Match`` header.
+
+    Args:
+        header (str, optional): The header value.
+
+    Returns:
+        list: The listed ETags with any weak ``W/`` prefix removed, ``["*"]`` for a wildcard, or an empty list
+        if the header is missing.
+    """
+    if not header:
+        return []
+    etags = []
+    for etag in header.split(","):
+        etag = etag.strip()
+        if etag.startswith("W/"):
+            etag = etag[2:]
+        if etag:
+            etags.append(etag)
+    return etags
+
+
+def etag_version(header: Optional[str]) -> Optional[int]:
+    """
+    Extracts the contact version required by an ``If-Match`` header.
+
+    ``If-Match`` uses the strong comparison, which a weak ``W/`` ETag never passes, so weak ETags are rejected
+    rather than treated as strong ones.
+
+    Args:
+        header (str, optional): The header value.
+
+    Raises:
+        ValueError: If the header does not hold a single strong contact ETag.
+
+    Returns:
+        int: The required version, or None when any version is accepted (no header or ``*``).
+    """
+    etags = [etag.strip() for etag in header.split(",") if etag.strip()] if header else []
+    if not etags or etags == ["*"]:
+        return None
+    if len(etags) != 1 or not (etags[0].startswith('"') and etags[0].endswith('"')):
+        raise ValueError("Invalid ETag")
+    return int(etags[0][1:-1])
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Checks an ``If-None-Match`` header against the current ETag, using the weak comparison it calls for.
+
+    Args:
+        header (str, optional): The header value.
+        etag (str): The current ETag of the representation.
+
+    Returns:
+        bool: True if the client's copy is current and a 304 can be sent.
+    """
+    etags = parse_etags(header)
+    return etags == ["*"] or etag in etags
@@ -0,0 +1,176 @@
+import logging
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from ..conf.config import settings
+from ..database.models import User
+from .auth import auth_service
+from .cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Token bucket holding up to ``capacity`` tokens and refilled at ``capacity`` tokens per ``period`` milliseconds.
+# The bucket is read, refilled, drawn from and written in one atomic step, using the Redis clock so that
+# application servers with drifting clocks share the same buckets. Returns whether the request is allowed
+# and, if not, the milliseconds until the next token.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * capacity / period)
+local allowed, wait = 0, 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = math.ceil((1 - tokens) * period / capacity)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], period)
+return {allowed, wait}
+"""
+
+
+def parse_limit(value: str) -> Tuple[int, int]:
+    """
+    Parses a rate limit such as ``10/60``.
+
+    Args:
+        value (str): The number of requests and the period in seconds, separated by ``/``.
+
+    Raises:
+        ValueError: If the limit is malformed.
+
+    Returns:
+        Tuple[int, int]: The number of requests and the period in seconds.
+    """
+    times, _, seconds = value.partition("/")
+    times, seconds = int(times), int(seconds)
+    if times < 1 or seconds < 1:
+        raise ValueError(f"Invalid rate limit: {value}")
+    return times, seconds
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter shared by all application servers through Redis.
+
+    Limits are looked up by route name in ``rate_limits`` and default to ``rate_limit_default``. Buckets are
+    keyed by route and user ID, or by client address on routes without authentication. A client that was
+    rejected is remembered in-process until its next token is due, so repeated requests from an exhausted
+    client are rejected without a Redis round trip.
+
+    The limiter is disabled until ``init`` is called and lets requests through on Redis errors.
+    """
+
+    def __init__(self, default: str = "10/60", limits: Optional[Dict[str, str]] = None,
+                 local_size: int = 4096, prefix: str = "ratelimit"):
+        self.redis: Optional[Redis] = None
+        self.default = parse_limit(default)
+        self.limits = {route: parse_limit(limit) for route, limit in (limits or {}).items()}
+        self.prefix = prefix
+        self.blocked = LRUCache(maxsize=local_size, ttl=0)
+        self._script = None
+
+    def init(self, redis: Redis) -> None:
+        """
+        Enables the limiter.
+
+        Args:
+            redis (Redis): The Redis client to store the buckets in.
+        """
+        self.redis = redis
+        self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def describe(self, route: str) -> str:
+        """
+        Describes the limit of a route, for the API documentation.
+
+        Args:
+            route (str): The route name.
+
+        Returns:
+            str: The limit, e.g. ``No more than 10 requests per 60 seconds``.
+        """
+        times, seconds = self.limits.get(route, self.default)
+        return f"No more than {times} requests per {seconds} seconds"
+
+    async def hit(self, route: str, client: str) -> float:
+        """
+        Takes a token from a client's bucket for a route.
+
+        Args:
+            route (str): The route name.
+            client (str): The client identifier, e.g. ``user:1``.
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the seconds until it would be.
+        """
+        key = f"{self.prefix}:{route}:{client}"
+        blocked_until = self.blocked.get(key)
+        if blocked_until is not None:
+            return max(blocked_until - time.monotonic(), 0.001)
+        if self.redis is None:
+            return 0
+        times, seconds = self.limits.get(route, self.default)
+        try:
+            allowed, wait = await self._script(keys=[key], args=[times, seconds * 1000])
+        except RedisError as err:
+            logger.warning("Rate limiter unavailable: %s", err)
+            return 0
+        if allowed:
+            return 0
+        retry_after = int(wait) / 1000
+        self.blocked.set(key, time.monotonic() + retry_after, ttl=retry_after)
+        return retry_after
+
+    async def _check(self, request: Request, client: str) -> None:
+        route = request.scope["route"].name
+        retry_after = await self.hit(route, client)
+        if retry_after:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too Many Requests",
+                                headers={"Retry-After": str(math.ceil(retry_after))})
+
+    async def __call__(self, request: Request, user: User = Depends(auth_service.get_current_user)) -> None:
+        """
+        Dependency that rate limits the current user on the current route.
+
+        Args:
+            request (Request): The current request.
+            user (User, optional): Current user. Defaults to Depends(auth_service.get_current_user).
+
+        Raises:
+            HTTPException: If the user has exhausted the route's limit.
+        """
+        await self._check(request, f"user:{user.id}")
+
+    async def by_address(self, request: Request) -> None:
+        """
+        Dependency that rate limits the client address on the current route, for routes without
+        authentication.
+
+        Args:
+            request (Request): The current request.
+
+        Raises:
+            HTTPException: If the client has exhausted the route's limit.
+        """
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            address = forwarded.split(",")[0].strip()
+        else:
+            address = request.client.host if request.client else "unknown"
+        await self._check(request, f"address:{address}")
+
+
+rate_limiter = RateLimiter(default=settings.rate_limit_default, limits=settings.rate_limits,
+                           local_size=settings.rate_limit_local_size)
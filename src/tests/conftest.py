@@ -1,6 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from main import app
@@ -15,6 +16,9 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db")
+AsyncTestingSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 @pytest.fixture(scope="module")
 def session():
@@ -30,11 +34,9 @@ def session():
 
 @pytest.fixture(scope="module")
 def client(session):
-    def override_get_db():
-        try:
-            yield session
-        finally:
-            session.close()
+    async def override_get_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
 
     app.dependency_overrides[get_db] = override_get_db
 
@@ -73,7 +75,7 @@ def create_user_db(body: user, db: session):
 def login_user_confirmed_true_and_hash_password(user, session):
     create_user_db(user, session)
     user_update: User = session.query(User).filter(User.email == user.email).first()
-    user_update.password = auth_service.get_password_hash(user_update.password)
+    user_update.password = auth_service.pwd_context.hash(user_update.password)
     user_update.confirmed = True
     session.commit()
 
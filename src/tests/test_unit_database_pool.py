@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import MagicMock
+
+from sqlalchemy.util.queue import Empty
+
+from src.database.pool import MeteredQueue, PoolStats, pool_stats
+
+
+class TestPoolStats(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = PoolStats(buckets=(0.01, 0.1, 1.0))
+
+    def test_observe(self):
+        self.stats.observe(0.005)
+        self.stats.observe(0.05)
+        self.stats.observe(5.0, timed_out=True)
+        self.assertEqual(self.stats.histogram, [1, 1, 0, 1])
+        self.assertEqual(self.stats.checkouts, 3)
+        self.assertEqual(self.stats.timeouts, 1)
+        self.assertAlmostEqual(self.stats.total_wait, 5.055)
+
+    def test_snapshot_with_pool(self):
+        pool = MagicMock()
+        pool.size.return_value = 5
+        pool.checkedin.return_value = 3
+        pool.checkedout.return_value = 2
+        pool.overflow.return_value = -3
+        self.stats.observe(0.5)
+        result = self.stats.snapshot(pool)
+        self.assertEqual(result["checked_out"], 2)
+        self.assertEqual(result["overflow"], -3)
+        self.assertEqual(result["wait_seconds_histogram"], {"0.01": 0, "0.1": 0, "1.0": 1, "+Inf": 0})
+
+    def test_reset(self):
+        self.stats.observe(0.5, timed_out=True)
+        self.stats.reset()
+        self.assertEqual(self.stats.checkouts, 0)
+        self.assertEqual(self.stats.timeouts, 0)
+        self.assertEqual(self.stats.histogram, [0, 0, 0, 0])
+
+
+class TestMeteredQueue(unittest.TestCase):
+
+    def setUp(self):
+        pool_stats.reset()
+        self.addCleanup(pool_stats.reset)
+        self.queue = MeteredQueue(2)
+
+    def test_get_observes_wait(self):
+        self.queue.put("connection", block=False)
+        self.assertEqual(self.queue.get(block=False), "connection")
+        self.assertEqual(pool_stats.checkouts, 1)
+        self.assertEqual(pool_stats.timeouts, 0)
+
+    def test_empty_without_waiting_is_not_a_timeout(self):
+        with self.assertRaises(Empty):
+            self.queue.get(block=False)
+        self.assertEqual(pool_stats.checkouts, 1)
+        self.assertEqual(pool_stats.timeouts, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from src.conf.config import settings
+from src.database import redis_db
+
+
+class TestRedisDb(unittest.IsolatedAsyncioTestCase):
+
+    def test_get_redis_shares_pool(self):
+        redis = redis_db.get_redis()
+        self.assertIs(redis, redis_db.get_redis())
+        self.assertIs(redis.connection_pool, redis_db.redis_pool)
+        self.assertEqual(redis_db.redis_pool.max_connections, settings.redis_max_connections)
+        self.assertEqual(redis_db.redis_pool.connection_kwargs["health_check_interval"],
+                         settings.redis_health_check_interval)
+
+    def test_pool_stats(self):
+        stats = redis_db.get_redis_pool_stats()
+        self.assertEqual(stats["max_connections"], settings.redis_max_connections)
+        self.assertEqual(stats["created"], stats["in_use"] + stats["available"])
+
+    async def test_close_redis(self):
+        with patch.object(redis_db.redis_client, "aclose", new_callable=AsyncMock) as aclose:
+            await redis_db.close_redis()
+        aclose.assert_awaited_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,64 +1,174 @@
+import base64
+import json
 import unittest
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from unittest.mock import MagicMock, patch
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import Contact, User
-from src.schemas import ContactModel, ContactUpdate
+from src.schemas import ContactModel, ContactUpdate, ContactPatch
 from src.repository.contacts import (
     get_contacts,
+    get_contacts_page,
+    encode_cursor,
+    decode_cursor,
+    encode_sync_token,
+    decode_sync_token,
+    get_changes,
     get_contact,
+    get_contact_version,
+    get_contacts_version,
     create_contact,
+    create_contacts,
     remove_contact,
     update_contact,
+    update_contacts,
+    remove_contacts,
+    patch_contact,
     search_contacts,
+    count_contacts,
+    birthday_window,
+    get_upcoming_birthdays,
 )
 
 
 class TestContacts(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
-        self.session = MagicMock(spec=Session)
+        self.session = MagicMock(spec=AsyncSession)
+        self.result = MagicMock()
+        self.session.execute.return_value = self.result
         self.user = User(id=1)
 
     async def test_get_contacts(self):
         contacts = [Contact(), Contact(), Contact()]
-        self.session.query().filter().offset().limit().all.return_value = contacts
+        self.result.scalars().all.return_value = contacts
         result = await get_contacts(skip=0, limit=10, user=self.user, db=self.session)
         self.assertEqual(result, contacts)
 
+    async def test_get_contacts_fields(self):
+        rows = [MagicMock(), MagicMock()]
+        self.result.all.return_value = rows
+        result = await get_contacts(skip=0, limit=10, user=self.user, db=self.session, fields=["id", "name"])
+        self.assertEqual(result, rows)
+        stmt = str(self.session.execute.call_args.args[0])
+        self.assertTrue(stmt.startswith("SELECT contacts.id, contacts.name \nFROM contacts"))
+
+    async def test_get_contacts_page_has_next(self):
+        contacts = [Contact(id=1), Contact(id=2), Contact(id=3)]
+        self.result.scalars().all.return_value = contacts
+        result, next_cursor = await get_contacts_page(cursor=None, limit=2, user=self.user, db=self.session)
+        self.assertEqual(result, contacts[:2])
+        self.assertEqual(decode_cursor(next_cursor), {"id": 2})
+
+    async def test_get_contacts_page_last(self):
+        contacts = [Contact(id=4)]
+        self.result.scalars().all.return_value = contacts
+        result, next_cursor = await get_contacts_page(cursor=encode_cursor(Contact(id=3)), limit=2,
+                                                      user=self.user, db=self.session)
+        self.assertEqual(result, contacts)
+        self.assertIsNone(next_cursor)
+
+    async def test_get_contacts_page_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            await get_contacts_page(cursor="not-a-cursor", limit=2, user=self.user, db=self.session)
+
+    async def test_get_contacts_page_sorted(self):
+        contacts = [Contact(id=7, name="Anna"), Contact(id=3, name="bob"), Contact(id=9, name="Carl")]
+        self.result.scalars().all.return_value = contacts
+        result, next_cursor = await get_contacts_page(cursor=None, limit=2, user=self.user, db=self.session,
+                                                      sort="name")
+        self.assertEqual(result, contacts[:2])
+        self.assertEqual(decode_cursor(next_cursor), {"id": 3, "s": "name", "k": "bob"})
+        stmt = str(self.session.execute.call_args.args[0])
+        self.assertIn("ORDER BY lower(contacts.name), contacts.id", stmt)
+
+    async def test_get_contacts_page_cursor_of_other_sort(self):
+        cursor = encode_cursor(Contact(id=3, date_of_birth=date(1990, 1, 1)), "-date_of_birth")
+        self.assertEqual(decode_cursor(cursor)["k"], date(1990, 1, 1))
+        with self.assertRaises(ValueError):
+            await get_contacts_page(cursor=cursor, limit=2, user=self.user, db=self.session, sort="date_of_birth")
+        with self.assertRaises(ValueError):
+            await get_contacts_page(cursor=encode_cursor(Contact(id=3)), limit=2, user=self.user, db=self.session,
+                                    sort="name")
+
+    def test_decode_cursor_invalid_sort_value(self):
+        for sort, value in (("name", 5), ("-last_name", ["x"]), ("date_of_birth", 19900101),
+                            ("date_of_birth", "1990-13-01"), ("email", "a@example.com")):
+            cursor = base64.urlsafe_b64encode(json.dumps({"id": 3, "s": sort, "k": value}).encode()).decode()
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
     async def test_get_contact_found(self):
         contact = Contact()
-        self.session.query().filter().first.return_value = contact
+        self.result.scalar_one_or_none.return_value = contact
         result = await get_contact(contact_id=1, user=self.user, db=self.session)
         self.assertEqual(result, contact)
 
     async def test_get_contact_not_found(self):
-        self.session.query().filter().first.return_value = None
+        self.result.scalar_one_or_none.return_value = None
         result = await get_contact(contact_id=1, user=self.user, db=self.session)
         self.assertIsNone(result)
 
     async def test_create_contact(self):
         body = ContactModel(name="John", last_name="Doe", email="john@example.com", phone_number="+48123456789",
                             date_of_birth="1900-01-01", additional_data="additional_data")
+        contact = Contact(id=1, name=body.name)
+        self.result.scalar_one.return_value = contact
         result = await create_contact(body=body, user=self.user, db=self.session)
-        self.assertEqual(result.name, body.name)
-        self.assertEqual(result.last_name, body.last_name)
-        self.assertEqual(result.email, body.email)
-        self.assertEqual(result.phone_number, body.phone_number)
-        self.assertEqual(result.date_of_birth, body.date_of_birth)
-        self.assertEqual(result.additional_data, body.additional_data)
-        self.assertTrue(hasattr(result, "id"))
+        self.assertEqual(result, contact)
+        stmt = self.session.execute.call_args.args[0]
+        params = stmt.compile().params
+        self.assertEqual(params["name"], body.name)
+        self.assertEqual(params["email"], body.email)
+        self.assertEqual(params["birthday_ordinal"], 1)
+        self.assertIn("UPDATE users", str(stmt.compile()))
+        self.session.commit.assert_awaited_once()
+        self.session.refresh.assert_not_awaited()
+
+    async def test_get_contact_version(self):
+        self.result.scalar_one_or_none.return_value = 4
+        self.assertEqual(await get_contact_version(contact_id=1, user=self.user, db=self.session), 4)
+
+    async def test_get_contacts_version(self):
+        self.result.scalar_one_or_none.return_value = None
+        self.assertEqual(await get_contacts_version(user=self.user, db=self.session), 0)
+
+    async def test_create_contacts(self):
+        bodies = [ContactModel(name="John", last_name="Doe", email=f"john{i}@example.com",
+                               phone_number="+48123456789", date_of_birth="1900-01-01") for i in range(3)]
+        self.result.all.return_value = [(10, "john0@example.com"), (12, "john2@example.com")]
+        result = await create_contacts(bodies=bodies, user=self.user, db=self.session)
+        self.assertEqual(result, [10, None, 12])
+        self.session.commit.assert_awaited_once()
+
+    async def test_create_contacts_chunked(self):
+        bodies = [ContactModel(name="John", last_name="Doe", email=f"john{i}@example.com",
+                               phone_number="+48123456789", date_of_birth="1900-01-01") for i in range(5)]
+        self.result.all.side_effect = [[(1, "john0@example.com"), (2, "john1@example.com")],
+                                       [(3, "john2@example.com"), (4, "john3@example.com")],
+                                       [(5, "john4@example.com")]]
+        with patch("src.repository.contacts.MAX_BIND_PARAMS", 22):
+            result = await create_contacts(bodies=bodies, user=self.user, db=self.session)
+        self.assertEqual(result, [1, 2, 3, 4, 5])
+        self.assertEqual(self.session.execute.await_count, 3)
+        self.session.commit.assert_awaited_once()
+
+    async def test_create_contacts_empty(self):
+        self.assertEqual(await create_contacts(bodies=[], user=self.user, db=self.session), [])
+        self.session.execute.assert_not_awaited()
 
     async def test_remove_contact_found(self):
         contact = Contact()
-        self.session.query().filter().first.return_value = contact
+        self.result.scalar_one_or_none.return_value = contact
         result = await remove_contact(contact_id=1, user=self.user, db=self.session)
         self.assertEqual(result, contact)
+        self.session.execute.assert_awaited_once()
+        self.session.delete.assert_not_awaited()
 
     async def test_remove_contact_not_found(self):
-        self.session.query().filter().first.return_value = None
+        self.result.scalar_one_or_none.return_value = None
         result = await remove_contact(contact_id=1, user=self.user, db=self.session)
         self.assertIsNone(result)
 
@@ -66,19 +176,171 @@ class TestContacts(unittest.IsolatedAsyncioTestCase):
         body = ContactUpdate(name="John", last_name="Doe", email="john@example.com", phone_number="+48123456789",
                              date_of_birth="1900-01-01", additional_data="additional_data")
         contact = Contact()
-        self.session.query().filter().first.return_value = contact
+        self.result.scalar_one_or_none.return_value = contact
         self.session.commit.return_value = None
         result = await update_contact(contact_id=1, body=body, user=self.user, db=self.session)
         self.assertEqual(result, contact)
+        self.session.execute.assert_awaited_once()
+        self.assertIn("RETURNING", str(self.session.execute.call_args.args[0]))
+        self.session.commit.assert_awaited_once()
 
     async def test_update_contact_not_found(self):
         body = ContactUpdate(name="John", last_name="Doe", email="john@example.com", phone_number="+48123456789",
                              date_of_birth="1900-01-01", additional_data="additional_data")
-        self.session.query().filter().first.return_value = None
+        self.result.scalar_one_or_none.return_value = None
         self.session.commit.return_value = None
         result = await update_contact(contact_id=1, body=body, user=self.user, db=self.session)
         self.assertIsNone(result)
 
+    async def test_update_contacts(self):
+        self.result.scalars().all.return_value = [1, 3]
+        body = ContactPatch(last_name="Doe", date_of_birth="1992-02-29")
+        result = await update_contacts(ids=[1, 2, 3], body=body, user=self.user, db=self.session)
+        self.assertEqual(result, [1, 3])
+        stmt = self.session.execute.call_args.args[0]
+        params = stmt.compile().params
+        self.assertEqual(params["birthday_ordinal"], 60)
+        self.assertNotIn("name", params)
+        self.assertIn("RETURNING", str(stmt))
+        self.session.commit.assert_awaited_once()
+
+    async def test_update_contacts_empty_patch(self):
+        self.result.scalars().all.return_value = [1]
+        result = await update_contacts(ids=[1, 2], body=ContactPatch(), user=self.user, db=self.session)
+        self.assertEqual(result, [1])
+        self.session.commit.assert_not_awaited()
+
+    async def test_remove_contacts(self):
+        self.result.scalars().all.return_value = [2]
+        result = await remove_contacts(ids=[1, 2], user=self.user, db=self.session)
+        self.assertEqual(result, [2])
+        stmt = str(self.session.execute.call_args.args[0])
+        self.assertIn("deleted_at=now()", stmt)
+        self.assertNotIn("DELETE", stmt)
+        self.session.commit.assert_awaited_once()
+
+    async def test_remove_contacts_not_found(self):
+        self.result.scalars().all.return_value = []
+        result = await remove_contacts(ids=[1, 2], user=self.user, db=self.session)
+        self.assertEqual(result, [])
+        self.session.commit.assert_not_awaited()
+        self.session.rollback.assert_awaited_once()
+
+    async def test_get_changes_snapshot(self):
+        contacts = [Contact(id=1, sync_version=4), Contact(id=3, sync_version=4), Contact(id=2, sync_version=5)]
+        self.result.scalars().all.return_value = contacts
+        result, next_token, has_more = await get_changes(since=None, limit=2, user=self.user, db=self.session)
+        self.assertEqual(result, contacts[:2])
+        self.assertEqual(decode_sync_token(next_token), {"v": 4, "id": 3})
+        self.assertTrue(has_more)
+        self.assertIn("deleted_at IS NULL", str(self.session.execute.call_args.args[0]))
+
+    async def test_get_changes_since(self):
+        since = encode_sync_token(Contact(id=3, sync_version=4))
+        self.result.scalars().all.return_value = []
+        result, next_token, has_more = await get_changes(since=since, limit=2, user=self.user, db=self.session)
+        self.assertEqual((result, next_token, has_more), ([], since, False))
+        stmt = self.session.execute.call_args.args[0]
+        self.assertNotIn("deleted_at IS NULL", str(stmt))
+        self.assertIn(4, stmt.compile().params.values())
+
+    async def test_get_changes_invalid_token(self):
+        with self.assertRaises(ValueError):
+            await get_changes(since=encode_cursor(Contact(id=1)), limit=2, user=self.user, db=self.session)
+
+    async def test_patch_contact(self):
+        contact = Contact(id=1, version=3)
+        self.result.scalar_one_or_none.return_value = contact
+        result = await patch_contact(contact_id=1, body=ContactPatch(phone_number="+48987654321"), user=self.user,
+                                     db=self.session, expected_version=2)
+        self.assertEqual(result, contact)
+        stmt = self.session.execute.call_args.args[0]
+        self.assertEqual(set(stmt.compile().params) - {"id_1", "user_id_1", "version_1", "version_2",
+                                                          "contacts_version_1", "id_2"},
+                         {"phone_number"})
+        self.session.commit.assert_awaited_once()
+
+    async def test_patch_contact_clear_date_of_birth(self):
+        self.result.scalar_one_or_none.return_value = Contact(id=1, version=2)
+        body = ContactPatch.model_validate({"date_of_birth": None})
+        await patch_contact(contact_id=1, body=body, user=self.user, db=self.session)
+        params = self.session.execute.call_args.args[0].compile().params
+        self.assertIsNone(params["date_of_birth"])
+        self.assertIsNone(params["birthday_ordinal"])
+        self.session.commit.assert_awaited_once()
+
+    async def test_patch_contact_version_mismatch(self):
+        self.result.scalar_one_or_none.return_value = None
+        result = await patch_contact(contact_id=1, body=ContactPatch(name="John"), user=self.user,
+                                     db=self.session, expected_version=2)
+        self.assertIsNone(result)
+        self.session.commit.assert_not_awaited()
+
+    async def test_patch_contact_empty(self):
+        self.result.scalar_one_or_none.return_value = Contact(id=1, version=3)
+        self.assertIsNone(await patch_contact(contact_id=1, body=ContactPatch(), user=self.user, db=self.session,
+                                              expected_version=2))
+        self.assertIsNotNone(await patch_contact(contact_id=1, body=ContactPatch(), user=self.user,
+                                                 db=self.session, expected_version=3))
+
+    async def test_search_contacts_ranked(self):
+        contacts = [Contact(), Contact()]
+        self.result.scalars().all.return_value = contacts
+        result = await search_contacts(user=self.user, db=self.session, name="Jo", email="example", limit=5)
+        self.assertEqual(result, contacts)
+        stmt = str(self.session.execute.call_args.args[0])
+        self.assertIn("word_similarity", stmt)
+        self.assertIn("LIMIT", stmt)
+
+    async def test_search_contacts_no_terms(self):
+        self.result.scalars().all.return_value = []
+        result = await search_contacts(user=self.user, db=self.session)
+        self.assertEqual(result, [])
+        self.assertNotIn("word_similarity", str(self.session.execute.call_args.args[0]))
+
+    async def test_search_contacts_sorted(self):
+        self.result.scalars().all.return_value = []
+        await search_contacts(user=self.user, db=self.session, name="Jo", sort="-last_name")
+        stmt = str(self.session.execute.call_args.args[0])
+        self.assertNotIn("word_similarity", stmt)
+        self.assertIn("ORDER BY lower(contacts.last_name) DESC, contacts.id DESC", stmt)
+
+    async def test_count_contacts_exact(self):
+        self.result.scalar_one.return_value = 42
+        self.assertEqual(await count_contacts(self.user, self.session, name="Jo"), (42, True))
+        self.assertIn("count(*)", str(self.session.execute.call_args.args[0]))
+
+    async def test_count_contacts_estimated(self):
+        with patch("src.repository.contacts.planned_rows", return_value=50000) as planned_rows:
+            self.assertEqual(await count_contacts(self.user, self.session, "estimated", 10000), (50000, False))
+            self.session.execute.assert_not_called()
+            planned_rows.return_value = 120
+            self.result.scalar_one.return_value = 117
+            self.assertEqual(await count_contacts(self.user, self.session, "estimated", 10000), (117, True))
+            self.assertEqual(await count_contacts(self.user, self.session, "planned", 10000), (120, False))
+
+    def test_birthday_window_within_year(self):
+        window = birthday_window(date(2023, 2, 26), 7)
+        self.assertEqual(window.right.clauses[0].value, 57)
+        self.assertEqual(window.right.clauses[1].value, 65)
+
+    def test_birthday_window_feb_29_in_non_leap_year(self):
+        window = birthday_window(date(2025, 2, 28), 0)
+        self.assertEqual([clause.value for clause in window.right.clauses], [59, 60])
+        window = birthday_window(date(2024, 2, 28), 0)
+        self.assertEqual([clause.value for clause in window.right.clauses], [59, 59])
+
+    def test_birthday_window_wraps_year_end(self):
+        window = birthday_window(date(2023, 12, 28), 7)
+        self.assertEqual([clause.right.value for clause in window.clauses], [363, 4])
+
+    async def test_get_upcoming_birthdays(self):
+        contacts = [Contact(date_of_birth=date(1990, 1, 1))]
+        self.result.scalars().all.return_value = contacts
+        result = await get_upcoming_birthdays(days=30, db=self.session)
+        self.assertEqual(result, contacts)
+        self.assertEqual(contacts[0].birthday_ordinal, 1)
+
 
 if __name__ == '__main__':
     unittest.main()
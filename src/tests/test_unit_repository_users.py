@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import MagicMock
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import User
 from src.schemas import UserModel
@@ -9,6 +9,7 @@ from src.repository.users import (
     get_user_by_email,
     create_user,
     update_token,
+    update_password,
     confirmed_email,
     update_avatar
 )
@@ -16,17 +17,19 @@ from src.repository.users import (
 
 class TestUsers(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
-        self.session = MagicMock(spec=Session)
+        self.session = MagicMock(spec=AsyncSession)
+        self.result = MagicMock()
+        self.session.execute.return_value = self.result
 
     async def test_get_user_by_email_found(self):
         user = User
-        self.session.query().filter().first.return_value = user
+        self.result.scalar_one_or_none.return_value = user
         result = await get_user_by_email(email=user.email, db=self.session)
         self.assertEqual(result, user)
 
     async def test_get_user_by_email_not_found(self):
         email = "example@example.com"
-        self.session.query().filter().first.return_value = None
+        self.result.scalar_one_or_none.return_value = None
         result = await get_user_by_email(email=email, db=self.session)
 
         self.assertIsNone(result)
@@ -48,16 +51,22 @@ class TestUsers(unittest.IsolatedAsyncioTestCase):
         await update_token(user, "token", self.session)
         self.assertEqual(user.refresh_token, "token")
 
+    async def test_update_password(self):
+        user = User(email="test@example.com", password="old_hash")
+        await update_password(user, "new_hash", self.session)
+        self.assertEqual(user.password, "new_hash")
+        self.session.commit.assert_awaited()
+
     async def test_confirmed_email(self):
         user = User(email="test@example.com")
-        self.session.query().filter().first.return_value = user
+        self.result.scalar_one_or_none.return_value = user
         self.session.commit.return_value = None
         await confirmed_email("test@example.com", self.session)
         self.assertTrue(user.confirmed)
 
     async def test_update_avatar(self):
         user = User(email="test@example.com")
-        self.session.query().filter().first.return_value = user
+        self.result.scalar_one_or_none.return_value = user
         self.session.commit.return_value = None
         result = await update_avatar("test@example.com", "url", self.session)
         self.assertEqual(result, user)
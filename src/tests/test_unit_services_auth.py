@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from jose import JWTError, jwt
+from passlib.context import CryptContext
+
+from src.services.auth import Auth
+from src.services.cache import LRUCache
+
+
+class TestAuthTokenCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.auth = Auth()
+        self.auth.token_cache = LRUCache(maxsize=8, ttl=60)
+
+    async def test_decode_token_cached(self):
+        token = await self.auth.create_access_token(data={"sub": "deadpool@example.com"})
+        with patch("src.services.auth.jwt.decode", wraps=jwt.decode) as decode:
+            first = self.auth.decode_token(token)
+            second = self.auth.decode_token(token)
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first["sub"], "deadpool@example.com")
+        self.assertEqual(self.auth.token_cache.stats()["hits"], 1)
+        self.assertEqual(self.auth.token_cache.stats()["misses"], 1)
+
+    async def test_decode_token_expired_not_cached(self):
+        token = await self.auth.create_access_token(data={"sub": "deadpool@example.com"}, expires_delta=-10)
+        with self.assertRaises(JWTError):
+            self.auth.decode_token(token)
+        self.assertEqual(len(self.auth.token_cache), 0)
+
+    async def test_decode_token_invalid(self):
+        with self.assertRaises(JWTError):
+            self.auth.decode_token("not-a-token")
+        self.assertEqual(len(self.auth.token_cache), 0)
+
+
+class TestAuthPasswords(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.auth = Auth()
+        self.auth.pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=4,
+                                             bcrypt__min_rounds=4, bcrypt__max_rounds=4)
+
+    async def test_hash_and_verify(self):
+        hashed = await self.auth.get_password_hash("123456789")
+        self.assertTrue(await self.auth.verify_password("123456789", hashed))
+        self.assertFalse(await self.auth.verify_password("wrong", hashed))
+
+    async def test_verify_and_update_rehashes_on_cost_change(self):
+        old_hash = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=5).hash("123456789")
+        verified, new_hash = await self.auth.verify_and_update_password("123456789", old_hash)
+        self.assertTrue(verified)
+        self.assertTrue(new_hash.startswith("$2b$04$"))
+
+    async def test_verify_and_update_current_cost(self):
+        hashed = await self.auth.get_password_hash("123456789")
+        self.assertEqual(await self.auth.verify_and_update_password("123456789", hashed), (True, None))
+
+    async def test_rejects_when_queue_full(self):
+        self.auth.pwd_max_pending = 0
+        with self.assertRaises(HTTPException) as ctx:
+            await self.auth.get_password_hash("123456789")
+        self.assertEqual(ctx.exception.status_code, 503)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from fastapi import HTTPException
+from PIL import Image
+
+from src.services.avatars import AvatarService, LocalAvatarStorage, resize_avatar
+
+
+def make_image(size=(800, 600), format="PNG") -> io.BytesIO:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 10, 10)).save(buffer, format=format)
+    buffer.seek(0)
+    return buffer
+
+
+class TestResizeAvatar(unittest.TestCase):
+
+    def test_resize(self):
+        for format in ("PNG", "JPEG"):
+            with Image.open(resize_avatar(make_image(format=format), size=250)) as avatar:
+                self.assertEqual(avatar.format, "JPEG")
+                self.assertEqual(avatar.size, (250, 250))
+
+
+class TestLocalAvatarStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = LocalAvatarStorage(Path(self.tmp.name), "/avatars/", chunk_size=4)
+        self.storage.configure()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_save(self):
+        url = self.storage.save("contacts/user", io.BytesIO(b"jpeg bytes"))
+        self.assertTrue(url.startswith("/avatars/contacts/user.jpg?v="))
+        self.assertEqual((Path(self.tmp.name) / "contacts" / "user.jpg").read_bytes(), b"jpeg bytes")
+        self.assertEqual([path.name for path in (Path(self.tmp.name) / "contacts").iterdir()], ["user.jpg"])
+
+    def test_rejects_key_outside_root(self):
+        with self.assertRaises(ValueError):
+            self.storage.save("../../user", io.BytesIO(b"jpeg bytes"))
+
+
+class TestAvatarService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.storage = MagicMock()
+        self.storage.save.return_value = "https://cdn/avatar.jpg"
+        self.service = AvatarService(workers=1, max_pending=1, size=50, max_bytes=1024 * 1024)
+        self.service.init(self.storage)
+
+    async def test_update(self):
+        result = await self.service.update(MagicMock(file=make_image(), size=1000), "contacts/user")
+        self.assertEqual(result, "https://cdn/avatar.jpg")
+        self.storage.configure.assert_called_once()
+        key, image = self.storage.save.call_args.args
+        self.assertEqual(key, "contacts/user")
+        self.assertEqual(Image.open(image).size, (50, 50))
+        self.assertEqual(self.service.pending, 0)
+
+    async def test_update_not_configured(self):
+        with self.assertRaises(HTTPException) as err:
+            await AvatarService().update(MagicMock(file=make_image(), size=1000), "contacts/user")
+        self.assertEqual(err.exception.status_code, 503)
+
+    async def test_update_too_large(self):
+        with self.assertRaises(HTTPException) as err:
+            await self.service.update(MagicMock(size=2 * 1024 * 1024), "contacts/user")
+        self.assertEqual(err.exception.status_code, 413)
+
+    async def test_update_invalid_image(self):
+        with self.assertRaises(HTTPException) as err:
+            await self.service.update(MagicMock(file=io.BytesIO(b"not an image"), size=12), "contacts/user")
+        self.assertEqual(err.exception.status_code, 400)
+        self.storage.save.assert_not_called()
+
+    async def test_update_busy(self):
+        self.service.pending = 1
+        with self.assertRaises(HTTPException) as err:
+            await self.service.update(MagicMock(file=make_image(), size=1000), "contacts/user")
+        self.assertEqual(err.exception.status_code, 503)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+from datetime import datetime
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+
+from redis.exceptions import RedisError
+
+from src.database.models import User
+from src.services.cache import ContactCache, LRUCache, UserCache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_expires(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        with patch("src.services.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+            cache.set("b", 2, ttl=5)
+        with patch("src.services.cache.time.monotonic", return_value=110.0):
+            self.assertEqual(cache.get("a"), 1)
+            self.assertIsNone(cache.get("b"))
+
+    def test_delete(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.delete("a")
+        cache.delete("missing")
+        self.assertIsNone(cache.get("a"))
+
+
+class TestContactCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.pipe = MagicMock()
+        self.pipe.execute = AsyncMock()
+        self.redis = MagicMock()
+        self.redis.pipeline.return_value.__aenter__.return_value = self.pipe
+        self.redis.get = AsyncMock()
+        self.redis.set = AsyncMock()
+        self.cache = ContactCache(ttl=60)
+        self.cache.init(self.redis)
+
+    async def test_disabled(self):
+        cache = ContactCache()
+        self.assertEqual(await cache.get(1, "contact:1"), (None, None))
+        await cache.set(1, "1", "contact:1", b"{}")
+        await cache.invalidate(1)
+
+    async def test_get_hit(self):
+        self.pipe.execute.return_value = [None, "7"]
+        self.redis.get.return_value = '{"id": 1}'
+        result = await self.cache.get(1, "contact:1")
+        self.assertEqual(result, ("7", '{"id": 1}'))
+        self.redis.get.assert_awaited_with("contacts:1:7:contact:1")
+
+    async def test_get_miss(self):
+        self.pipe.execute.return_value = [True, "7"]
+        self.redis.get.return_value = None
+        self.assertEqual(await self.cache.get(1, "contact:1"), ("7", None))
+
+    async def test_get_redis_error(self):
+        self.pipe.execute.side_effect = RedisError("down")
+        self.assertEqual(await self.cache.get(1, "contact:1"), (None, None))
+
+    async def test_set(self):
+        await self.cache.set(1, "7", "contact:1", b"{}")
+        self.redis.set.assert_awaited_with("contacts:1:7:contact:1", b"{}", ex=60)
+
+    async def test_set_without_version(self):
+        await self.cache.set(1, None, "contact:1", b"{}")
+        self.redis.set.assert_not_awaited()
+
+    async def test_response_round_trip(self):
+        await self.cache.set_response(1, "7", "contact:1", '"3"', b'{"id": 1}')
+        self.redis.set.assert_awaited_with("contacts:1:7:contact:1", '"3"\n{"id": 1}', ex=60)
+        self.pipe.execute.return_value = [None, "7"]
+        self.redis.get.return_value = self.redis.set.call_args.args[1]
+        self.assertEqual(await self.cache.get_response(1, "contact:1"), ("7", '"3"', '{"id": 1}'))
+
+    async def test_invalidate(self):
+        await self.cache.invalidate(1)
+        self.pipe.incr.assert_called_with("contacts:1:version")
+        self.pipe.execute.assert_awaited()
+
+
+class TestUserCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.user = User(id=1, username="deadpool", email="deadpool@example.com", password="hash",
+                         refresh_token="token", created_at=datetime(2024, 1, 1), avatar=None)
+        self.pipe = MagicMock()
+        self.pipe.execute = AsyncMock(return_value=[None, "7"])
+        self.redis = MagicMock()
+        self.redis.pipeline.return_value.__aenter__.return_value = self.pipe
+        self.redis.get = AsyncMock(return_value=None)
+        self.redis.set = AsyncMock()
+        self.cache = UserCache(maxsize=8, ttl=60, local_ttl=10)
+
+    async def test_set_caches_detached_profile(self):
+        version, user = await self.cache.get(self.user.email)
+        self.assertIsNone(user)
+        cached = await self.cache.set(self.user, version)
+        self.assertIsNot(cached, self.user)
+        self.assertIsNone(cached.password)
+        self.assertIsNone(cached.refresh_token)
+        self.assertEqual((await self.cache.get(self.user.email))[1].id, 1)
+
+    async def test_redis_tier(self):
+        self.cache.init(self.redis)
+        version, _ = await self.cache.get(self.user.email)
+        await self.cache.set(self.user, version)
+        self.redis.set.assert_awaited_with("users:deadpool@example.com:7", ANY, ex=60)
+        payload = self.redis.set.call_args.args[1]
+        self.assertNotIn("hash", payload)
+        self.cache.local.clear()
+        self.redis.get.return_value = payload
+        _, result = await self.cache.get(self.user.email)
+        self.assertEqual(result.username, "deadpool")
+        self.redis.get.assert_awaited_with("users:deadpool@example.com:7")
+
+    async def test_invalidate(self):
+        self.cache.init(self.redis)
+        version, _ = await self.cache.get(self.user.email)
+        await self.cache.set(self.user, version)
+        await self.cache.invalidate(self.user.email)
+        self.pipe.incr.assert_called_with("users:deadpool@example.com:version")
+        self.pipe.execute.return_value = [None, "8"]
+        self.assertIsNone((await self.cache.get(self.user.email))[1])
+        self.redis.get.assert_awaited_with("users:deadpool@example.com:8")
+
+    async def test_set_after_concurrent_invalidate(self):
+        self.cache.init(self.redis)
+        version, _ = await self.cache.get(self.user.email)
+        await self.cache.invalidate(self.user.email)
+        await self.cache.set(self.user, version)
+        self.assertIsNone(self.cache.local.get(self.user.email))
+        self.pipe.execute.return_value = [None, "8"]
+        await self.cache.get(self.user.email)
+        self.assertNotEqual(self.redis.set.call_args.args[0], self.redis.get.call_args.args[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import gzip
+import json
+import unittest
+from collections import namedtuple
+from datetime import date
+from typing import List
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pydantic import TypeAdapter
+
+from src.database.models import User
+from src.services.contacts_io import (
+    CONTACT_FIELDS,
+    iter_csv_records,
+    iter_ndjson_records,
+    import_contacts,
+    export_contacts,
+    dump_contacts,
+    dump_contact_page,
+    parse_fields,
+    serialize_contacts,
+)
+from src.schemas import ContactPage, ContactResponse
+
+ContactRow = namedtuple("ContactRow", CONTACT_FIELDS)
+
+
+async def chunked(data: bytes, size: int = 7):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def collect(records):
+    return [record async for record in records]
+
+
+class TestContactsImport(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.user = User(id=1)
+        self.session = MagicMock()
+
+    async def test_iter_csv_records(self):
+        data = ('﻿name,last_name,email\r\n'
+                'John,Doe,john@example.com\r\n'
+                '"Multi\nline, name",Doe,multi@example.com\r\n'
+                '\r\n'
+                'short,row\r\n').encode()
+        records = await collect(iter_csv_records(chunked(data)))
+        self.assertEqual(records[0], (1, {"name": "John", "last_name": "Doe", "email": "john@example.com"}, None))
+        self.assertEqual(records[1][1]["name"], "Multi\nline, name")
+        self.assertEqual(records[2], (3, None, "Expected 3 fields, got 2"))
+
+    async def test_iter_csv_records_stray_quote(self):
+        data = b'name,last_name\nSean,O"Brien\nJohn,"Doe ""Jr"""\nJane,Doe\n'
+        records = await collect(iter_csv_records(chunked(data)))
+        self.assertEqual([record for _, record, _ in records], [{"name": "Sean", "last_name": 'O"Brien'},
+                                                                {"name": "John", "last_name": 'Doe "Jr"'},
+                                                                {"name": "Jane", "last_name": "Doe"}])
+
+    async def test_iter_csv_records_too_long(self):
+        data = b'name,last_name\nJohn,"unterminated\n' + b'x\n' * 10 + b'Jane,Doe\n'
+        records = await collect(iter_csv_records(chunked(data), max_record_size=16))
+        self.assertEqual(records[0], (1, None, "Record is too long"))
+        self.assertEqual(records[-1], (len(records), {"name": "Jane", "last_name": "Doe"}, None))
+
+    async def test_iter_ndjson_records(self):
+        data = '{"name": "Joź"}\n\nnot json\n[1]\n{"name": "last"}'.encode()
+        records = await collect(iter_ndjson_records(chunked(data, 3)))
+        self.assertEqual(records[0], (1, {"name": "Joź"}, None))
+        self.assertEqual(records[1][0], 3)
+        self.assertTrue(records[1][2].startswith("Invalid JSON"))
+        self.assertEqual(records[2], (4, None, "Expected a JSON object"))
+        self.assertEqual(records[3], (5, {"name": "last"}, None))
+
+    async def test_import_contacts(self):
+        valid = {"name": "John", "last_name": "Doe", "email": "john@example.com", "phone_number": "+48123456789",
+                 "date_of_birth": "1990-01-01"}
+
+        async def records():
+            yield 1, valid, None
+            yield 2, {**valid, "email": "jane@example.com"}, None
+            yield 3, {**valid, "email": "invalid"}, None
+            yield 4, None, "Invalid JSON"
+            yield 5, {**valid, "email": "dup@example.com"}, None
+
+        create_contacts = AsyncMock(side_effect=[[1, 2], [None]])
+        with patch("src.services.contacts_io.repository_contacts.create_contacts", create_contacts):
+            report = await import_contacts(records(), self.user, self.session, batch_size=2, max_errors=2)
+        self.assertEqual(create_contacts.await_count, 2)
+        self.assertEqual((report["total"], report["inserted"], report["failed"]), (5, 2, 3))
+        self.assertEqual([error["row"] for error in report["errors"]], [3, 4])
+        self.assertTrue(report["errors_truncated"])
+
+
+class TestContactsExport(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.user = User(id=1)
+        self.rows = [ContactRow(name="John", last_name="Doe", email="john@example.com", phone_number="+48123456789",
+                                date_of_birth=date(1990, 1, 1), additional_data=None, id=i) for i in range(3)]
+        self.session_local = MagicMock()
+        self.session_local.return_value.__aenter__.return_value = MagicMock()
+
+    async def export(self, **kwargs):
+        async def stream_contacts(user, db, fields, batch_size):
+            for row in self.rows:
+                yield row
+
+        with patch("src.services.contacts_io.SessionLocal", self.session_local), \
+                patch("src.services.contacts_io.repository_contacts.stream_contacts", stream_contacts):
+            return b"".join([chunk async for chunk in export_contacts(self.user, **kwargs)])
+
+    async def test_export_ndjson(self):
+        lines = (await self.export(format="ndjson")).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])["date_of_birth"], "1990-01-01")
+
+    async def test_export_csv_gzip(self):
+        lines = gzip.decompress(await self.export(format="csv", compress=True)).decode().splitlines()
+        self.assertEqual(lines[0], ",".join(CONTACT_FIELDS))
+        self.assertEqual(lines[1], "John,Doe,john@example.com,+48123456789,1990-01-01,,0")
+        self.assertEqual(len(lines), 4)
+
+
+
+class TestContactsSerialization(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [ContactRow(name="Jöhn", last_name="Doe", email="john@example.com", phone_number="+48123456789",
+                                date_of_birth=date(1990, 1, 1), additional_data=None if i else "a \"b\"", id=i)
+                     for i in range(3)]
+
+    def test_dump_contacts_matches_response_model(self):
+        adapter = TypeAdapter(List[ContactResponse])
+        expected = adapter.dump_json(adapter.validate_python(self.rows, from_attributes=True))
+        self.assertEqual(dump_contacts(self.rows), expected)
+
+    def test_dump_contact_page_matches_response_model(self):
+        items = TypeAdapter(List[ContactResponse]).validate_python(self.rows, from_attributes=True)
+        expected = ContactPage(items=items, next_cursor="abc").model_dump_json().encode()
+        self.assertEqual(dump_contact_page(dump_contacts(self.rows), "abc"), expected)
+        self.assertTrue(dump_contact_page(b"[]", None).endswith(b'"next_cursor":null}'))
+
+    def test_parse_fields(self):
+        self.assertIsNone(parse_fields(None))
+        self.assertEqual(parse_fields(" phone_number,name,phone_number"), ("name", "phone_number", "id"))
+        with self.assertRaises(ValueError):
+            parse_fields("name,password")
+
+    def test_serialize_sparse_fields(self):
+        Row = namedtuple("Row", ["name", "phone_number", "id"])
+        rows = [Row(name="John", phone_number="+48123456789", id=1)]
+        fields = parse_fields("name,phone_number")
+        self.assertEqual(serialize_contacts(rows, fields), b'[{"name":"John","phone_number":"+48123456789","id":1}]')
+        self.assertEqual(dump_contacts(rows), serialize_contacts(rows, fields))
+
+if __name__ == '__main__':
+    unittest.main()
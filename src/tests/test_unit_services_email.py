@@ -0,0 +1,98 @@
+import asyncio
+import socket
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiosmtplib
+
+from src.conf.config import settings
+from src.services.email import MailSender, verification_message
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    Controller = None
+
+
+def make_sender(port: int = 1025) -> MailSender:
+    return MailSender(hostname="127.0.0.1", port=port, username=None, password=None, sender="noreply@example.com",
+                      start_tls=False, pool_size=2, timeout=5)
+
+
+class TestMailSender(unittest.IsolatedAsyncioTestCase):
+
+    def test_verification_message(self):
+        message = verification_message("user@example.com", "user", "http://host/")
+        self.assertEqual(message["To"], "user@example.com")
+        self.assertEqual(message["From"], f"Rest API <{settings.mail_from}>")
+        self.assertIn("http://host/api/auth/confirmed_email/", message.get_content())
+
+    async def test_reuses_connection(self):
+        sender = make_sender()
+        smtp = MagicMock(is_connected=True, send_message=AsyncMock())
+        with patch("src.services.email.aiosmtplib.SMTP", return_value=smtp) as smtp_class:
+            smtp.connect = AsyncMock()
+            await sender.send(MagicMock())
+            await sender.send_many([MagicMock(), MagicMock()])
+        smtp_class.assert_called_once()
+        self.assertEqual(smtp.send_message.await_count, 3)
+
+    async def test_reconnects_when_pooled_connection_was_closed(self):
+        sender = make_sender()
+        stale = MagicMock(is_connected=True)
+        stale.send_message = AsyncMock(side_effect=aiosmtplib.SMTPServerDisconnected("closed"))
+        fresh = MagicMock(connect=AsyncMock(), send_message=AsyncMock())
+        sender._idle.append((float("inf"), stale))
+        with patch("src.services.email.aiosmtplib.SMTP", return_value=fresh):
+            await sender.send(MagicMock())
+        stale.close.assert_called_once()
+        fresh.send_message.assert_awaited_once()
+
+    async def test_failed_connection_is_not_pooled(self):
+        sender = make_sender()
+        smtp = MagicMock(connect=AsyncMock())
+        smtp.send_message = AsyncMock(side_effect=aiosmtplib.SMTPRecipientsRefused([]))
+        with patch("src.services.email.aiosmtplib.SMTP", return_value=smtp):
+            with self.assertRaises(aiosmtplib.SMTPRecipientsRefused):
+                await sender.send(MagicMock())
+        self.assertEqual(sender._idle, [])
+
+
+@unittest.skipIf(Controller is None, "aiosmtpd is not installed")
+class TestMailSenderSmtp(unittest.IsolatedAsyncioTestCase):
+
+    class Handler:
+        def __init__(self):
+            self.messages = []
+            self.sessions = set()
+
+        async def handle_DATA(self, server, session, envelope):
+            self.messages.append(envelope)
+            self.sessions.add(id(session))
+            return "250 OK"
+
+    def setUp(self):
+        self.handler = self.Handler()
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.controller = Controller(self.handler, hostname="127.0.0.1", port=self.port)
+        self.controller.start()
+
+    def tearDown(self):
+        self.controller.stop()
+
+    async def test_send_over_pooled_connections(self):
+        sender = make_sender(self.port)
+        await sender.send_many([verification_message(f"user{i}@example.com", "user", "http://host/")
+                                for i in range(3)])
+        await asyncio.gather(*(sender.send(verification_message("other@example.com", "user", "http://host/"))
+                               for _ in range(4)))
+        await sender.close()
+        self.assertEqual(len(self.handler.messages), 7)
+        self.assertLessEqual(len(self.handler.sessions), 2)
+        self.assertEqual(self.handler.messages[0].rcpt_tos, ["user0@example.com"])
+
+
+if __name__ == '__main__':
+    unittest.main()
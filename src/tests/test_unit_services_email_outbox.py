@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from redis.exceptions import RedisError
+
+from src.services.email_outbox import EmailOutbox
+
+
+class TestEmailOutbox(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.pipe = MagicMock()
+        self.pipe.execute = AsyncMock()
+        self.redis = MagicMock()
+        self.redis.pipeline.return_value.__aenter__.return_value = self.pipe
+        self.redis.xclaim = AsyncMock()
+        self.redis.xpending_range = AsyncMock()
+        self.redis.hincrby = AsyncMock()
+        self.outbox = EmailOutbox(max_attempts=3, retry_base=10)
+        self.outbox.init(self.redis)
+
+    async def test_enqueue(self):
+        self.assertTrue(await self.outbox.enqueue("user@example.com", "user", "http://host/"))
+        self.pipe.xadd.assert_called_once_with(
+            "email:outbox", {"email": "user@example.com", "username": "user", "host": "http://host/"})
+
+    async def test_enqueue_unavailable(self):
+        self.assertFalse(await EmailOutbox().enqueue("user@example.com", "user", "http://host/"))
+        self.pipe.execute.side_effect = RedisError("down")
+        self.assertFalse(await self.outbox.enqueue("user@example.com", "user", "http://host/"))
+
+    async def test_stats_unavailable(self):
+        self.redis.hgetall = AsyncMock(side_effect=RedisError("down"))
+        stats = await self.outbox.stats()
+        self.assertEqual(stats["sent"], 0)
+        self.assertEqual(stats["lag_seconds"], 0.0)
+
+    def test_backoff(self):
+        self.assertEqual([self.outbox.backoff(n) for n in (1, 2, 3)], [10, 20, 40])
+
+    async def test_process(self):
+        async def send(message):
+            if message["email"] == "bad@example.com":
+                raise ConnectionError("refused")
+
+        entries = [("1-0", {"email": "a@example.com"}), ("2-0", {"email": "bad@example.com"}),
+                   ("3-0", {"email": "b@example.com"})]
+        self.assertEqual(await self.outbox.process(entries, send), 2)
+        self.pipe.xack.assert_called_once_with("email:outbox", "email-workers", "1-0", "3-0")
+        self.pipe.xdel.assert_called_once_with("email:outbox", "1-0", "3-0")
+        self.pipe.hincrby.assert_any_call("email:outbox:metrics", "failed", 1)
+
+    async def test_claim_due(self):
+        self.redis.xpending_range.return_value = [
+            {"message_id": "1-0", "time_since_delivered": 15000, "times_delivered": 1},
+            {"message_id": "2-0", "time_since_delivered": 15000, "times_delivered": 2},
+            {"message_id": "3-0", "time_since_delivered": 50000, "times_delivered": 3},
+        ]
+        self.redis.xclaim.side_effect = [[("1-0", {"email": "a@example.com"})],
+                                         [("3-0", {"email": "c@example.com"})]]
+        entries = await self.outbox.claim_due("worker")
+        self.assertEqual(entries, [("1-0", {"email": "a@example.com"})])
+        self.redis.xclaim.assert_any_await("email:outbox", "email-workers", "worker", 10000, ["1-0"])
+        self.redis.xclaim.assert_any_await("email:outbox", "email-workers", "worker", 40000, ["3-0"])
+        self.pipe.xadd.assert_called_once_with("email:outbox:dead", {"email": "c@example.com"},
+                                               maxlen=100000, approximate=True)
+        self.pipe.xack.assert_called_once_with("email:outbox", "email-workers", "3-0")
+
+    async def test_claim_due_scans_past_backoff(self):
+        outbox = EmailOutbox(batch_size=2, retry_base=10)
+        outbox.init(self.redis)
+        self.redis.xpending_range.side_effect = [
+            [{"message_id": "1-0", "time_since_delivered": 15000, "times_delivered": 3},
+             {"message_id": "2-0", "time_since_delivered": 15000, "times_delivered": 3}],
+            [{"message_id": "3-0", "time_since_delivered": 15000, "times_delivered": 1}],
+        ]
+        self.redis.xclaim.return_value = [("3-0", {"email": "c@example.com"})]
+        self.assertEqual(await outbox.claim_due("worker"), [])
+        self.assertEqual(await outbox.claim_due("worker"), [("3-0", {"email": "c@example.com"})])
+        self.redis.xpending_range.assert_awaited_with("email:outbox", "email-workers", min="(2-0", max="+",
+                                                      count=2, idle=10000)
+        self.assertEqual(outbox._scan_from, "-")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from src.services.etag import make_etag, parse_etags, etag_matches, etag_version
+
+
+class TestETag(unittest.TestCase):
+
+    def test_make_etag(self):
+        self.assertEqual(make_etag(3), '"3"')
+        self.assertEqual(make_etag(1, 42), '"1-42"')
+
+    def test_parse_etags(self):
+        self.assertEqual(parse_etags(None), [])
+        self.assertEqual(parse_etags('"1", W/"2"'), ['"1"', '"2"'])
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"1", W/"2"', '"2"'))
+        self.assertTrue(etag_matches("*", '"5"'))
+        self.assertFalse(etag_matches('"1"', '"2"'))
+        self.assertFalse(etag_matches(None, '"2"'))
+
+    def test_etag_version(self):
+        self.assertIsNone(etag_version(None))
+        self.assertIsNone(etag_version("*"))
+        self.assertEqual(etag_version('"7"'), 7)
+        with self.assertRaises(ValueError):
+            etag_version('W/"7"')
+        with self.assertRaises(ValueError):
+            etag_version('"1", "2"')
+        with self.assertRaises(ValueError):
+            etag_version("7")
+        with self.assertRaises(ValueError):
+            etag_version('"abc"')
+
+
+if __name__ == '__main__':
+    unittest.main()
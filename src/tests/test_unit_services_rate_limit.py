@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from redis.exceptions import RedisError
+
+from src.services.rate_limit import RateLimiter, parse_limit
+
+
+class TestParseLimit(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(parse_limit("10/60"), (10, 60))
+
+    def test_invalid(self):
+        for value in ("10", "0/60", "ten/60"):
+            with self.assertRaises(ValueError):
+                parse_limit(value)
+
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.script = AsyncMock(return_value=[1, 0])
+        self.redis = MagicMock()
+        self.redis.register_script.return_value = self.script
+        self.limiter = RateLimiter(default="10/60", limits={"export_contacts": "5/30"})
+        self.limiter.init(self.redis)
+
+    def test_describe(self):
+        self.assertEqual(self.limiter.describe("read_contacts"), "No more than 10 requests per 60 seconds")
+        self.assertEqual(self.limiter.describe("export_contacts"), "No more than 5 requests per 30 seconds")
+
+    async def test_disabled(self):
+        self.assertEqual(await RateLimiter().hit("read_contacts", "user:1"), 0)
+
+    async def test_allowed(self):
+        self.assertEqual(await self.limiter.hit("read_contacts", "user:1"), 0)
+        self.script.assert_awaited_with(keys=["ratelimit:read_contacts:user:1"], args=[10, 60000])
+        await self.limiter.hit("export_contacts", "user:1")
+        self.script.assert_awaited_with(keys=["ratelimit:export_contacts:user:1"], args=[5, 30000])
+
+    async def test_rejected_locally_until_next_token(self):
+        self.script.return_value = [0, 4500]
+        self.assertEqual(await self.limiter.hit("read_contacts", "user:1"), 4.5)
+        retry_after = await self.limiter.hit("read_contacts", "user:1")
+        self.assertTrue(0 < retry_after <= 4.5)
+        self.assertEqual(self.script.await_count, 1)
+        self.script.return_value = [1, 0]
+        self.assertEqual(await self.limiter.hit("read_contacts", "user:2"), 0)
+
+    async def test_redis_error(self):
+        self.script.side_effect = RedisError("down")
+        self.assertEqual(await self.limiter.hit("read_contacts", "user:1"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()